@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021, 2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021, 2023, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -27,8 +27,9 @@ Perform actions related to etcd on a Shasta system.
 import logging
 import os
 import socket
+from contextlib import ExitStack
 
-from sat.cli.bootsys.util import get_ssh_client
+from sat.cli.bootsys.util import pooled_ssh
 
 from paramiko import SSHException
 
@@ -41,6 +42,10 @@ ETCD_SNAPSHOT_DIR = '/root/etcd_backup'
 # This is the name of the snapshot file
 ETCD_SNAPSHOT_FILE = 'backup.db'
 
+# Timeout in seconds for reading the output of each command run to save the
+# snapshot, so that a hung etcdctl does not block the pooled connection forever
+ETCD_COMMAND_TIMEOUT = 300
+
 
 class EtcdSnapshotFailure(Exception):
     """Failed to save a snapshot of etcd."""
@@ -52,9 +57,40 @@ class EtcdInactiveFailure(EtcdSnapshotFailure):
     pass
 
 
+def _run_etcd_command(ssh_client, command):
+    """Run the given command over the given SSH client.
+
+    Args:
+        ssh_client (paramiko.SSHClient): the connected client to run the command with
+        command (str): the command to run
+
+    Returns:
+        Tuple of:
+            exit_status (int): the exit status of the command
+            stdout (str): the stdout of the command decoded with utf-8
+            stderr (str): the stderr of the command decoded with utf-8
+
+    Raises:
+        SSHException: if the server failed to execute the command
+        socket.timeout: if reading the output of the command timed out
+    """
+    _, stdout, stderr = ssh_client.exec_command(command, timeout=ETCD_COMMAND_TIMEOUT)
+    # Read the output before waiting for the exit status so that the remote
+    # command cannot block on a full channel window.
+    stdout_str = stdout.read().decode()
+    stderr_str = stderr.read().decode()
+    return stdout.channel.recv_exit_status(), stdout_str, stderr_str
+
+
 def save_etcd_snapshot_on_host(hostname, host_keys=None):
     """Connect to the given host and save an etcd snapshot to a file.
 
+    The SSH connection is taken from the connection pool and returned to it
+    afterwards, so that later steps on the same host can reuse it. This
+    includes the case where etcd is inactive or a command exits with a
+    non-zero exit status. If a command cannot be executed or reading its
+    output times out, the connection is closed instead.
+
     Args:
         hostname (str): the hostname to connect to
         host_keys (paramiko.HostKeys or None): the hostkeys to use when
@@ -66,42 +102,46 @@ def save_etcd_snapshot_on_host(hostname, host_keys=None):
         EtcdSnapshotFailure: if there is a failure to create the directory for
             the snapshot or a failure to create the snapshot
     """
-    ssh_client = get_ssh_client(host_keys=host_keys)
-
-    try:
-        ssh_client.connect(hostname)
-    except (SSHException, socket.error) as err:
-        raise EtcdSnapshotFailure(f'Failed to connect to {hostname}: {err}')
-
-    # If etcd is not active, attempting to create a snapshot will hang
-    try:
-        _, stdout, stderr = ssh_client.exec_command("systemctl is-active etcd")
-    except SSHException as err:
-        raise EtcdSnapshotFailure(f'Failed to determine if etcd is active on {hostname} '
-                                  f'before attempting snapshot: {err}')
-
-    exit_status = stdout.channel.recv_exit_status()
-    if exit_status:
-        raise EtcdInactiveFailure(f'The etcd service is not active on {hostname} '
-                                  f'so a snapshot cannot be created.')
-
-    mkdir_cmd = f'mkdir -p {ETCD_SNAPSHOT_DIR}'
-    etcd_cmd = (f'ETCDCTL_API=3 '
-                f'etcdctl --cacert /etc/kubernetes/pki/etcd/ca.crt '
-                f'--cert /etc/kubernetes/pki/etcd/peer.crt '
-                f'--key /etc/kubernetes/pki/etcd/peer.key '
-                f'snapshot save {os.path.join(ETCD_SNAPSHOT_DIR, ETCD_SNAPSHOT_FILE)}')
-    commands = [mkdir_cmd, etcd_cmd]
-
-    for command in commands:
+    # Failures reported by commands which ran to completion are raised after
+    # the client has been returned to the pool.
+    failure = None
+    with ExitStack() as stack:
+        try:
+            ssh_client = stack.enter_context(pooled_ssh(hostname, host_keys=host_keys))
+        except (SSHException, socket.error) as err:
+            raise EtcdSnapshotFailure(f'Failed to connect to {hostname}: {err}')
+
+        # If etcd is not active, attempting to create a snapshot will hang
         try:
-            _, stdout, stderr = ssh_client.exec_command(command)
-        except SSHException as err:
-            raise EtcdSnapshotFailure(f'Failed to execute "{command}" on {hostname}: {err}')
+            exit_status, _, _ = _run_etcd_command(ssh_client, 'systemctl is-active etcd')
+        except (SSHException, socket.error) as err:
+            raise EtcdSnapshotFailure(f'Failed to determine if etcd is active on {hostname} '
+                                      f'before attempting snapshot: {err}')
 
-        exit_status = stdout.channel.recv_exit_status()
         if exit_status:
-            raise EtcdSnapshotFailure(
-                f'Command "{command}" on {hostname} exited with non-zero exit status: '
-                f'{exit_status}, stderr: {stderr.read()}, stdout: {stdout.read()}'
-            )
+            failure = EtcdInactiveFailure(f'The etcd service is not active on {hostname} '
+                                          f'so a snapshot cannot be created.')
+        else:
+            mkdir_cmd = f'mkdir -p {ETCD_SNAPSHOT_DIR}'
+            etcd_cmd = (f'ETCDCTL_API=3 '
+                        f'etcdctl --cacert /etc/kubernetes/pki/etcd/ca.crt '
+                        f'--cert /etc/kubernetes/pki/etcd/peer.crt '
+                        f'--key /etc/kubernetes/pki/etcd/peer.key '
+                        f'snapshot save {os.path.join(ETCD_SNAPSHOT_DIR, ETCD_SNAPSHOT_FILE)}')
+            commands = [mkdir_cmd, etcd_cmd]
+
+            for command in commands:
+                try:
+                    exit_status, stdout, stderr = _run_etcd_command(ssh_client, command)
+                except (SSHException, socket.error) as err:
+                    raise EtcdSnapshotFailure(f'Failed to execute "{command}" on {hostname}: {err}')
+
+                if exit_status:
+                    failure = EtcdSnapshotFailure(
+                        f'Command "{command}" on {hostname} exited with non-zero exit status: '
+                        f'{exit_status}, stderr: {stderr}, stdout: {stdout}'
+                    )
+                    break
+
+    if failure is not None:
+        raise failure
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021, 2023, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021, 2023, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -30,14 +30,16 @@ import socket
 import time
 import urllib3.exceptions
 from collections import namedtuple
-from multiprocessing import Process, Queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from queue import Queue
+from threading import Event
 
 from csm_api_client.k8s import load_kube_api
 from kubernetes.client import BatchV1Api
 from kubernetes.config import ConfigException
 from paramiko import SSHException
 
-from sat.cached_property import cached_property
 from sat.cli.bootsys.ceph import (
     check_ceph_health,
     toggle_ceph_freeze_flags,
@@ -47,7 +49,12 @@ from sat.cli.bootsys.ceph import (
 from sat.cli.bootsys.etcd import save_etcd_snapshot_on_host, EtcdInactiveFailure, EtcdSnapshotFailure
 from sat.cli.bootsys.hostkeys import FilteredHostKeys
 from sat.cli.bootsys.k8s import KubernetesAPIAvailableWaiter
-from sat.cli.bootsys.util import get_and_verify_ncn_groups, get_ssh_client, FatalBootsysError
+from sat.cli.bootsys.util import (
+    close_pooled_ssh_clients,
+    get_and_verify_ncn_groups,
+    pooled_ssh,
+    FatalBootsysError
+)
 from sat.config import get_config_value
 from sat.cronjob import recreate_namespaced_stuck_cronjobs
 from sat.util import BeginEndLogger, pester_choices, prompt_continue
@@ -55,16 +62,33 @@ from sat.waiting import Waiter
 
 LOGGER = logging.getLogger(__name__)
 
-# Get a list of containers using crictl ps. With a 5 minute overall timeout, run up to 50 'crictl ps' commands at
-# a time with up to 3 containers per command. Each 'crictl stop' command has a timeout of 5 seconds per container,
-# adding up to 15 seconds if they all time out.
+# Get a list of containers using crictl ps. With a 5 minute overall timeout, run up to 50 'crictl stop' commands at
+# a time with up to 10 containers per command, so that each command connects to containerd once for several
+# containers. Each 'crictl stop' command has a timeout of 5 seconds per container, adding up to 50 seconds if they
+# all time out. Nothing is run if there are no containers.
 CONTAINER_STOP_SCRIPT = (
     'crictl ps -q | '
-    'timeout -s 9 5m xargs -n 1 -P 50 '
-    'timeout -s 9 --foreground 15s crictl stop --timeout 5'
+    'timeout -s 9 5m xargs -r -n 10 -P 50 '
+    'timeout -s 9 --foreground 50s crictl stop --timeout 5'
 )
 # Default timeout in seconds for service start/stop actions
 SERVICE_ACTION_TIMEOUT = 30
+# Timeout in seconds for reading the output of the remote command which starts or
+# stops a service. The command prints nothing while systemctl blocks, so this must
+# be longer than systemd's default 90 second start and stop timeouts plus the time
+# spent waiting for the service to leave a transitional state.
+SERVICE_ACTION_COMMAND_TIMEOUT = 300
+# Timeout in seconds for reading the output of each remote command run while
+# stopping containers. This must be longer than the timeout in CONTAINER_STOP_SCRIPT.
+CONTAINER_STOP_COMMAND_TIMEOUT = 360
+# After starting or stopping a service, check its state on the remote host up to
+# this many times, at this interval in seconds, while it is still in a transitional
+# state such as 'activating' or 'deactivating'
+SERVICE_SETTLE_CHECKS = 20
+SERVICE_SETTLE_INTERVAL = 0.5
+# Maps from target service states to the systemctl commands which reach them
+_STATE_TO_ACTION = {'active': 'start', 'inactive': 'stop'}
+_ENABLED_TO_ACTION = {'enabled': 'enable', 'disabled': 'disable'}
 
 
 class FatalPlatformError(Exception):
@@ -85,13 +109,21 @@ class NonFatalPlatformError(Exception):
     pass
 
 
+class ServiceWaitCancelled(Exception):
+    """Waiting for a service was cancelled because of a failure on another host."""
+    pass
+
+
 class RemoteServiceWaiter(Waiter):
     """Start/stop and optionally enable/disable a service over SSH and wait for it to reach target state."""
 
     VALID_TARGET_STATE_VALUES = ('active', 'inactive')
     VALID_TARGET_ENABLED_VALUES = ('enabled', 'disabled')
+    # Factor by which the interval between polls grows after each poll
+    POLL_BACKOFF = 1.5
 
-    def __init__(self, host, service_name, target_state, timeout, poll_interval=5, target_enabled=None, host_keys=None):
+    def __init__(self, host, service_name, target_state, timeout, initial_poll_interval=0.2,
+                 max_poll_interval=5.0, target_enabled=None, host_keys=None, cancel_event=None):
         """Construct a new RemoteServiceWaiter.
 
         Args:
@@ -100,14 +132,24 @@ class RemoteServiceWaiter(Waiter):
             target_state (str): the desired state of the service, e.g.
                 'active' or 'inactive'
             timeout (int): the timeout, in seconds, for the wait operation.
-            poll_interval (int): the interval, in seconds, between polls for
-                completion.
+            initial_poll_interval (float): the interval, in seconds, between
+                the first and second polls for completion. The interval grows
+                by a factor of `POLL_BACKOFF` after each poll, so services
+                which reach the target state quickly are not waited on for
+                long.
+            max_poll_interval (float): the maximum interval, in seconds,
+                between polls for completion.
             target_enabled (str or None): If 'enabled', enable the service.
                 If 'disabled', disable the service. If None, do neither.
             host_keys (paramiko.hostkeys.HostKeys): If not None, use the given host
                 keys object instead of loading the system host keys.
+            cancel_event (threading.Event or None): If not None, stop waiting
+                and fail when this event is set. The event is checked before
+                the service action and between polls, so a service action
+                which is already running on the host still runs to completion.
         """
-        super().__init__(timeout, poll_interval=poll_interval)
+        super().__init__(timeout, poll_interval=initial_poll_interval, poll_backoff=self.POLL_BACKOFF,
+                         max_poll_interval=max_poll_interval)
 
         # Validate input
         if target_state not in self.VALID_TARGET_STATE_VALUES:
@@ -121,70 +163,160 @@ class RemoteServiceWaiter(Waiter):
         self.service_name = service_name
         self.target_state = target_state
         self.target_enabled = target_enabled
-        self.ssh_client = get_ssh_client(host_keys=host_keys)
-
-    def _run_remote_command(self, command, nonzero_error=True):
+        self.host_keys = host_keys
+        self.cancel_event = cancel_event
+        # Whether waiting stopped because `cancel_event` was set
+        self.cancelled = False
+        # While waiting, this is a client taken from the SSH connection pool
+        self.ssh_client = None
+        # The state of the service reported after the service action, which
+        # is used for the first completion check instead of querying again
+        self._last_known_state = None
+
+        # These do not change while waiting, so build them once rather than
+        # on every poll.
+        target_enabled_description = f'and {target_enabled} ' if target_enabled else ''
+        self._condition_name = (f'service {service_name} {target_state} '
+                                f'{target_enabled_description}on {host}')
+        self._is_active_command = f'systemctl is-active {service_name}'
+        self._service_action_command = self._get_service_action_command()
+
+    def _run_remote_command(self, command, nonzero_error=True, timeout=None):
         """Run the given command on the remote host.
 
         Args:
             command (str): The command to run on the remote host.
             nonzero_error (bool): If true, raise a RuntimeError for
                 non-zero exit codes.
+            timeout (float or None): The timeout, in seconds, for reading the
+                output of the command. If None, use `self.timeout`.
 
         Returns:
-            A 2-tuple of paramiko.channel.ChannelFile objects representing
-            stdout and stderr from the command.
+            A 2-tuple of str representing stdout and stderr from the command
+            decoded with utf-8.
 
         Raises:
             RuntimeError: if the command returned a non-zero exit code
                 and nonzero_exit = True.
             SSHException: if the server failed to execute the command.
+            socket.timeout: if reading the output of the command timed out.
         """
         LOGGER.debug('Executing command "%s" on host %s', command, self.host)
-        stdin, stdout, stderr = self.ssh_client.exec_command(command)
+        if timeout is None:
+            timeout = self.timeout
+        stdin, stdout, stderr = self.ssh_client.exec_command(command, timeout=timeout)
+        # Read the output before waiting for the exit status so that the remote
+        # command cannot block on a full channel window.
+        stdout_str = stdout.read().decode()
+        stderr_str = stderr.read().decode()
         exit_code = stdout.channel.recv_exit_status()
         if exit_code and nonzero_error:
             error_message = (f'Command {command} on host {self.host} returned non-zero exit code {exit_code}. '
-                             f'Stdout: "{stdout.read()}" Stderr: "{stderr.read()}"')
+                             f'Stdout: "{stdout_str}" Stderr: "{stderr_str}"')
             raise RuntimeError(error_message)
 
-        return stdout, stderr
+        return stdout_str, stderr_str
 
     def wait_for_completion(self):
-        """Wait for completion but catch and log errors, and fail if errors are caught."""
+        """Wait for completion but catch and log errors, and fail if errors are caught.
+
+        If waiting is cancelled, this is logged at the info level rather than
+        as an error, so that the failure on the host which caused the
+        cancellation stands out.
+        """
         try:
-            return super().wait_for_completion()
+            with pooled_ssh(self.host, host_keys=self.host_keys) as self.ssh_client:
+                try:
+                    return super().wait_for_completion()
+                except ServiceWaitCancelled as err:
+                    self.cancelled = True
+                    LOGGER.info('Stopped waiting for condition "%s": %s', self.condition_name(), err)
+                    return False
         except (RuntimeError, socket.error, SSHException) as e:
             LOGGER.error(e)
             return False
 
     def condition_name(self):
-        return (f'service {self.service_name} {self.target_state} '
-                f'{f"and {self.target_enabled} " if self.target_enabled else ""}'
-                f'on {self.host}')
+        return self._condition_name
+
+    def _get_service_action_command(self):
+        """Get a command which reports the service state and changes it if needed.
+
+        The command prints the active state of the service, followed by its
+        enabled state if `self.target_enabled` is set, separated by a space.
+        It then starts or stops the service if it is not in the target state,
+        and enables or disables it if it is not in the target enabled state.
+        Finally, it waits on the remote host for a bounded time while the
+        service is in a transitional state, prints the active state of the
+        service on a second line, and exits with the exit status of the
+        start/stop and enable/disable actions. Doing all of this in a single
+        command saves a round trip to the remote host for each separate
+        systemctl command and for most polls of the service state.
+
+        Returns:
+            str: the command to run on the remote host
+        """
+        systemctl_action = _STATE_TO_ACTION[self.target_state]
+        state_vars = ['"$active"']
+        commands = [f'active=$({self._is_active_command})']
+        actions = [f'{{ [ "$active" = {self.target_state} ] || systemctl {systemctl_action} {self.service_name}; }}']
+
+        if self.target_enabled:
+            systemctl_action = _ENABLED_TO_ACTION[self.target_enabled]
+            state_vars.append('"$enabled"')
+            commands.append(f'enabled=$(systemctl is-enabled {self.service_name})')
+            actions.append(f'{{ [ "$enabled" = {self.target_enabled} ] || '
+                           f'systemctl {systemctl_action} {self.service_name}; }}')
+
+        commands.append(f'echo {" ".join(state_vars)}')
+        commands.append(' && '.join(actions))
+        commands.extend([
+            'status=$?',
+            f'for _ in $(seq {SERVICE_SETTLE_CHECKS}); do active=$({self._is_active_command}); '
+            f'case "$active" in activating|deactivating|reloading) sleep {SERVICE_SETTLE_INTERVAL};; '
+            f'*) break;; esac; done',
+            'echo "$active"',
+            'exit $status'
+        ])
+        return '; '.join(commands)
 
     def pre_wait_action(self):
-        """Connect to remote host and start/stop the service if needed.
+        """Start/stop and enable/disable the service on the remote host if needed.
 
-        This method will set `self.completed` to True if no action is needed.
+        This method will set `self.completed` to True if the service was
+        already in the target state. Otherwise, it records the state of the
+        service after starting or stopping it for the first completion check.
 
         Raises:
-            SSHException, socket.error: if connecting to the host fails,
-                or if the server failed to execute a command.
+            ServiceWaitCancelled: if `self.cancel_event` is set.
             RuntimeError, SSHException: from _run_remote_command.
         """
-        systemctl_action = ('stop', 'start')[self.target_state == 'active']
-        self.ssh_client.connect(self.host)
-        if self.has_completed():
+        # Do not change the service if waiting was cancelled before it started
+        self.on_check_action()
+        stdout, _ = self._run_remote_command(self._service_action_command,
+                                             timeout=SERVICE_ACTION_COMMAND_TIMEOUT)
+        initial_states, _, current_state = stdout.partition('\n')
+        active_state, _, enabled_state = initial_states.strip().partition(' ')
+
+        if active_state == self.target_state:
             self.completed = True
         else:
             LOGGER.debug('Found service not in %s state on host %s.', self.target_state, self.host)
-            self._run_remote_command(f'systemctl {systemctl_action} {self.service_name}')
+            self._last_known_state = current_state.strip()
 
-        if self.target_enabled and self._get_enabled() != self.target_enabled:
+        if self.target_enabled and enabled_state != self.target_enabled:
             LOGGER.debug('Found service not in %s state on host %s.', self.target_enabled, self.host)
-            systemctl_action = ('disable', 'enable')[self.target_enabled == 'enabled']
-            self._run_remote_command(f'systemctl {systemctl_action} {self.service_name}')
+        elif self.completed:
+            LOGGER.debug('Found %s already; no action needed.', self.condition_name())
+
+    def on_check_action(self):
+        """Stop waiting if waiting has been cancelled.
+
+        Raises:
+            ServiceWaitCancelled: if `self.cancel_event` is set.
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ServiceWaitCancelled('waiting was cancelled due to a failure on another host')
 
     def _get_active(self):
         """Check whether the service is active or not according to systemctl.
@@ -197,63 +329,42 @@ class RemoteServiceWaiter(Waiter):
             RuntimeError, SSHException: from _run_remote_command.
         """
         # systemctl is-active always exits with a non-zero code if the service is not active
-        stdout, stderr = self._run_remote_command(f'systemctl is-active {self.service_name}',
-                                                  nonzero_error=False)
-        return stdout.read().decode().strip()
-
-    def _get_enabled(self):
-        """Check whether the service is enabled or not according to systemctl.
-
-        Returns:
-            The string representation of the service's enabled status; e.g.
-                'enabled', 'disabled', or 'unknown'.
-
-        Raises:
-            RuntimeError, SSHException: from _run_remote_command.
-        """
-        # systemctl is-enabled always exits with a non-zero code if the service is not active
-        stdout, stderr = self._run_remote_command(f'systemctl is-enabled {self.service_name}',
-                                                  nonzero_error=False)
-        return stdout.read().decode().strip()
+        stdout, _ = self._run_remote_command(self._is_active_command, nonzero_error=False)
+        return stdout.strip()
 
     def has_completed(self):
         """Check that the service is active or inactive on the remote host.
 
+        The first check uses the state reported by the service action in
+        `pre_wait_action`, if any, rather than querying the remote host.
+
         Raises:
             RuntimeError, SSHException: from _get_active.
         """
-        current_state = self._get_active()
+        if self._last_known_state is not None:
+            current_state, self._last_known_state = self._last_known_state, None
+        else:
+            current_state = self._get_active()
         return current_state == self.target_state
 
 
-class ContainerStopProcess(Process):
-    """A process that will stop containers on hosts."""
+class ContainerStopper:
+    """Stops containers on a host over a pooled SSH connection."""
     def __init__(self, host, host_keys=None, result_queue=None):
-        """Create a process to stop containers in containerd on the given host.
+        """Create an object to stop containers in containerd on the given host.
 
         Args:
             host (str): The host on which to stop containers in containerd
             host_keys (paramiko.hostkeys.HostKeys): parsed known hosts file
                 containing keys for other hosts
+            result_queue (queue.Queue): the queue on which to put a tuple of
+                the host and a bool indicating whether containers were stopped
         """
-        super().__init__()
         self.host = host
         self.host_keys = host_keys
         self.result_queue = result_queue
-
-    @cached_property
-    def ssh_client(self):
-        """paramiko.SSHClient: an SSHClient connected to `self.host`
-
-        Raises:
-            SystemExit(1): if there is a failure to connect to `self.host`.
-        """
-        try:
-            ssh_client = get_ssh_client(self.host_keys)
-            ssh_client.connect(self.host)
-            return ssh_client
-        except (socket.error, SSHException) as err:
-            self._err_exit(f'Failed to connect to host {self.host}: {err}')
+        # While running, this is a client taken from the SSH connection pool
+        self.ssh_client = None
 
     def _run_remote_command(self, cmd, err_on_non_zero=True):
         """Run the given command on `self.host`.
@@ -270,17 +381,19 @@ class ContainerStopProcess(Process):
                 stderr (str): the stderr of the command decoded with utf-8
 
         Raises:
-            SystemExit(1): if the command failed to execute on the remote host.
+            SystemExit(1): if the command failed to execute on the remote host
+                or reading its output timed out.
         """
         try:
-            _, stdout, stderr = self.ssh_client.exec_command(cmd)
+            _, stdout, stderr = self.ssh_client.exec_command(cmd, timeout=CONTAINER_STOP_COMMAND_TIMEOUT)
+            # Read the output before waiting for the exit status so that the remote
+            # command cannot block on a full channel window.
+            stdout_str = stdout.read().decode()
+            stderr_str = stderr.read().decode()
+            exit_status = stdout.channel.recv_exit_status()
         except (SSHException, socket.error) as err:
             self._err_exit(f'Failed to execute {cmd} on {self.host}: {err}')
         else:
-            exit_status = stdout.channel.recv_exit_status()
-            stdout_str = stdout.read().decode()
-            stderr_str = stderr.read().decode()
-
             if exit_status and err_on_non_zero:
                 self._err_exit(f'Command "{cmd}" on {self.host} exited with exit status {exit_status}. '
                                f'stdout: {stdout_str}, stderr: {stderr_str}')
@@ -288,7 +401,7 @@ class ContainerStopProcess(Process):
             return exit_status, stdout_str, stderr_str
 
     def _err_exit(self, err_msg):
-        """Log an error message, mark failure, and exit process.
+        """Log an error message, mark failure, and stop.
 
         Args:
             err_msg (str): The error message to log.
@@ -301,7 +414,7 @@ class ContainerStopProcess(Process):
         raise SystemExit(1)
 
     def _success_exit(self, info_msg):
-        """Log an info message, mark success, and exit process.
+        """Log an info message, mark success, and stop.
 
         Args:
             info_msg (str): The info message to log.
@@ -324,11 +437,63 @@ class ContainerStopProcess(Process):
         """
         return self._run_remote_command('crictl ps -q')[1].splitlines()
 
+    def _stop_containers(self):
+        """Stop containers in containerd on `self.host` using `self.ssh_client`.
+
+        Returns:
+            The message to log on success.
+
+        Raises:
+            SystemExit(1): if the container stop operation fails
+        """
+        while True:
+            exit_status, stdout, stderr = self._run_remote_command('systemctl is-active containerd',
+                                                                   err_on_non_zero=False)
+            if exit_status:
+                if 'inactive' in stdout:
+                    return (f'containerd is not active on {self.host} so '
+                            f'there are no containers to stop.')
+                self._err_exit(f'Failed to query if containerd is active. '
+                               f'stdout: {stdout}, stderr: {stderr}')
+
+            running_containers = self._get_running_containers()
+
+            if not running_containers:
+                return f'No containers to stop on {self.host}.'
+
+            LOGGER.debug('The following containers were running before the stop attempt '
+                         'on %s: %s', self.host, running_containers)
+
+            exit_status, stdout, stderr = self._run_remote_command(CONTAINER_STOP_SCRIPT,
+                                                                   err_on_non_zero=False)
+
+            stopped_containers = stdout.splitlines()
+            LOGGER.debug('The following containers were stopped successfully on %s: %s',
+                         self.host, stopped_containers)
+
+            if exit_status:
+                # This is most likely a timeout but not necessarily an error if
+                # containers have been stopped.
+                LOGGER.debug(f'One or more "crictl stop" commands timed out on {self.host}')
+
+            # Check and see if they've all been stopped.
+            running_containers = self._get_running_containers()
+
+            if running_containers:
+                LOGGER.warning(f'Some containers are still running after stop attempt on {self.host}: '
+                               f'{running_containers}')
+                LOGGER.info(f'Retrying container stop procedure on {self.host}')
+                time.sleep(1)
+            else:
+                return f'All containers stopped on {self.host}.'
+
     def run(self):
         """Attempt to stop containers in containerd on the host.
 
-        If successful, the process will exit with its `success` attribute set to
-        True. If unsuccessful, the `success` attribute will be False.
+        The SSH connection is taken from the connection pool and returned to
+        it afterwards, so that the subsequent containerd stop step can reuse
+        it. If successful, `(self.host, True)` is put on `self.result_queue`.
+        If unsuccessful, `(self.host, False)` is put on `self.result_queue`.
 
         The following conditions are considered success:
             - containerd is already inactive and thus containers would not be running
@@ -337,6 +502,7 @@ class ContainerStopProcess(Process):
               if the command to stop them encountered timeouts
 
         The following conditions are considered failures:
+            - Failure to connect to the host
             - Failure to query the status of containerd
             - Failure to query for running containers
             - Running containers still exist after attempting to stop them, perhaps
@@ -344,60 +510,30 @@ class ContainerStopProcess(Process):
 
         Raises:
             SystemExit: if the container stop operation fails, raises a SystemExit
-                with code 1. If it's successful, raises a SystemExit with a code 0.
-                This is used to stop the process.
+                with code 1. If it's successful, raises a SystemExit with a code 0
+                after the SSH connection has been returned to the pool.
+                This is used to stop the container stop operation.
         """
-        try:
-            while True:
-                exit_status, stdout, stderr = self._run_remote_command('systemctl is-active containerd',
-                                                                       err_on_non_zero=False)
-                if exit_status:
-                    if 'inactive' in stdout:
-                        self._success_exit(f'containerd is not active on {self.host} so '
-                                           f'there are no containers to stop.')
-                    else:
-                        self._err_exit(f'Failed to query if containerd is active. '
-                                       f'stdout: {stdout}, stderr: {stderr}')
-
-                running_containers = self._get_running_containers()
-
-                if not running_containers:
-                    self._success_exit(f'No containers to stop on {self.host}.')
-
-                LOGGER.debug('The following containers were running before the stop attempt '
-                             'on %s: %s', self.host, running_containers)
-
-                exit_status, stdout, stderr = self._run_remote_command(CONTAINER_STOP_SCRIPT,
-                                                                       err_on_non_zero=False)
-
-                stopped_containers = stdout.splitlines()
-                LOGGER.debug('The following containers were stopped successfully on %s: %s',
-                             self.host, stopped_containers)
-
-                if exit_status:
-                    # This is most likely a timeout but not necessarily an error if
-                    # containers have been stopped.
-                    LOGGER.debug(f'One or more "crictl stop" commands timed out on {self.host}')
-
-                # Check and see if they've all been stopped.
-                running_containers = self._get_running_containers()
+        with ExitStack() as stack:
+            try:
+                self.ssh_client = stack.enter_context(pooled_ssh(self.host, host_keys=self.host_keys))
+            except (socket.error, SSHException) as err:
+                self._err_exit(f'Failed to connect to host {self.host}: {err}')
 
-                if running_containers:
-                    LOGGER.warning(f'Some containers are still running after stop attempt on {self.host}: '
-                                   f'{running_containers}')
-                    LOGGER.info(f'Retrying container stop procedure on {self.host}')
-                    time.sleep(1)
-                else:
-                    self._success_exit(f'All containers stopped on {self.host}.')
+            success_msg = self._stop_containers()
 
-        finally:
-            self.ssh_client.close()
+        self._success_exit(success_msg)
 
 
 def do_service_action_on_hosts(hosts, service, target_state,
                                timeout=SERVICE_ACTION_TIMEOUT, target_enabled=None):
     """Do a service start/stop and optionally enable/disable across hosts in parallel.
 
+    When the action fails on one host, it is not started on any more hosts,
+    and waiting on the other hosts is cancelled. A service action which is
+    already running on another host still runs to completion, because
+    cancellation is only checked before the service action and between polls.
+
     Args:
         hosts (list of str): The list of hosts on which to operate.
         service (str): The name of the service on which to operate.
@@ -413,14 +549,30 @@ def do_service_action_on_hosts(hosts, service, target_state,
         FatalPlatformError: if the service action fails on any of the given hosts
     """
     host_keys = FilteredHostKeys(hostnames=hosts)
+    cancel_event = Event()
     service_action_waiters = [RemoteServiceWaiter(host, service, target_state=target_state,
                                                   timeout=timeout, target_enabled=target_enabled,
-                                                  host_keys=host_keys)
+                                                  host_keys=host_keys, cancel_event=cancel_event)
                               for host in hosts]
-    for waiter in service_action_waiters:
-        waiter.wait_for_completion_async()
-    for waiter in service_action_waiters:
-        waiter.wait_for_completion_await()
+    # Worker threads are only started as needed, so this does not create more
+    # threads than there are hosts.
+    with ThreadPoolExecutor(max_workers=get_config_value('bootsys.max_parallel_ssh')) as executor:
+        waiters_by_future = {executor.submit(waiter.wait_for_completion): waiter
+                             for waiter in service_action_waiters}
+        for future in as_completed(waiters_by_future):
+            waiter = waiters_by_future[future]
+            try:
+                future.result()
+            except Exception as err:
+                LOGGER.error('Unexpected error waiting for %s: %s', waiter.condition_name(), err)
+
+            if not waiter.completed:
+                # The whole action fails if it fails on any host, so do not start
+                # it on more hosts, and stop waiting on the hosts in progress.
+                for other_future in waiters_by_future:
+                    other_future.cancel()
+                cancel_event.set()
+                break
 
     if not all(waiter.completed for waiter in service_action_waiters):
         raise FatalPlatformError(f'Failed to ensure {service} is {target_state} '
@@ -438,13 +590,15 @@ def do_stop_containers(ncn_groups):
     host_keys = FilteredHostKeys(hostnames=k8s_ncns)
     result_queue = Queue()
     # This currently stops all containers in parallel before stopping containerd
-    # on each ncn in parallel.  It probably could be faster if it was all in parallel.
-    container_stop_processes = [ContainerStopProcess(ncn, host_keys=host_keys, result_queue=result_queue)
-                                for ncn in k8s_ncns]
-    for process in container_stop_processes:
-        process.start()
-    for process in container_stop_processes:
-        process.join()
+    # on each ncn in parallel. The SSH connection to each ncn is kept in the pool
+    # between the two steps, so stopping containerd does not need to reconnect.
+    container_stoppers = [ContainerStopper(ncn, host_keys=host_keys, result_queue=result_queue)
+                          for ncn in k8s_ncns]
+    # ContainerStopper.run always finishes by raising SystemExit after putting
+    # its result on result_queue, so the futures' results are not checked.
+    with ThreadPoolExecutor(max_workers=get_config_value('bootsys.max_parallel_ssh')) as executor:
+        for container_stopper in container_stoppers:
+            executor.submit(container_stopper.run)
 
     failed_ncns = []
     while not result_queue.empty():
@@ -453,6 +607,8 @@ def do_stop_containers(ncn_groups):
             failed_ncns.append(host)
 
     if failed_ncns:
+        # Report failures in a consistent order regardless of completion order
+        failed_ncns = [ncn for ncn in k8s_ncns if ncn in failed_ncns]
         raise NonFatalPlatformError(f'Failed to stop containers on the following NCN(s): '
                                     f'{", ".join(failed_ncns)}')
 
@@ -651,6 +807,27 @@ def do_platform_action(args, action):
         LOGGER.error(f'Not proceeding with platform {action}: {err}')
         raise SystemExit(1)
 
+    try:
+        _do_platform_steps(steps, ncn_groups, action)
+    finally:
+        close_pooled_ssh_clients()
+
+
+def _do_platform_steps(steps, ncn_groups, action):
+    """Execute the given ordered platform steps.
+
+    Args:
+        steps (list of PlatformServicesStep): The steps to execute.
+        ncn_groups (dict): A dict mapping from NCN group names to hosts.
+        action (str): The action being performed, used in log messages.
+
+    Returns:
+        None
+
+    Raises:
+        SystemExit: if a step encounters a fatal error, or if a step encounters
+            a non-fatal error and the user chooses not to continue.
+    """
     for step in steps:
         try:
             info_message = f'Executing step: {step.description}'
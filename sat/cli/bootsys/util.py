@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020-2021, 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020-2021, 2023-2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -27,7 +27,10 @@ Generic common utilities for the bootsys subcommand.
 
 import logging
 import re
-from collections import defaultdict
+import socket
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from threading import Lock
 
 import yaml
 from paramiko import SSHClient, AutoAddPolicy
@@ -36,6 +39,31 @@ from sat.util import pester_choices
 
 LOGGER = logging.getLogger(__name__)
 
+# Keyword arguments used when connecting SSH clients to NCNs in the pool. These
+# bound the time spent on an unreachable or unresponsive host during the TCP
+# connection, SSH banner exchange, and authentication, and skip GSS-API, which
+# is not used on NCNs. The SHA-1 key exchange algorithms are disabled because
+# they are slow and weak, and current OpenSSH servers offer stronger ones.
+SSH_CONNECT_KWARGS = {
+    'timeout': 10,
+    'banner_timeout': 10,
+    'auth_timeout': 10,
+    'gss_auth': False,
+    'gss_kex': False,
+    'disabled_algorithms': {
+        'kex': [
+            'diffie-hellman-group-exchange-sha1',
+            'diffie-hellman-group14-sha1',
+            'diffie-hellman-group1-sha1',
+        ],
+    },
+}
+# Interval in seconds between keepalive packets sent on pooled SSH connections,
+# so that connections left idle between steps are not dropped
+SSH_KEEPALIVE_INTERVAL = 30
+# Idle, connected SSH clients which may be reused, keyed by hostname
+_SSH_POOL = defaultdict(deque)
+_SSH_POOL_LOCK = Lock()
 
 # Maps from management NCN subroles to prefixes for those hostnames
 MGMT_NCN_HOSTNAME_PREFIXES = {
@@ -50,35 +78,37 @@ class FatalBootsysError(Exception):
     pass
 
 
-def get_mgmt_ncn_hostnames(subroles):
-    """Get a set of management non-compute node (NCN) hostnames.
+def get_mgmt_ncn_hostnames_by_subrole(subroles):
+    """Get management non-compute node (NCN) hostnames grouped by subrole.
 
     The hostnames of the NCNs are parsed from the hosts file on the local host
-    where this is executed.
+    where this is executed. The hosts file is read once for all the given
+    subroles.
 
     Args:
         subroles (list of str): subroles for which to get hostnames, possible
             values are keys of `MGMT_NCN_HOSTNAME_PREFIXES`.
 
     Returns:
-        Set of hostnames for the management NCNs which have the given subroles.
+        A dict mapping from each of the given subroles to the set of hostnames
+        for the management NCNs which have that subrole.
 
     Raises:
         ValueError: if given any invalid subroles values
     """
-    ncn_hostnames = set()
-
     invalid_subroles = [subrole for subrole in subroles
                         if subrole not in MGMT_NCN_HOSTNAME_PREFIXES]
     if invalid_subroles:
         raise ValueError(f'Invalid subroles given: {", ".join(invalid_subroles)}')
 
+    ncn_hostnames_by_subrole = {subrole: set() for subrole in subroles}
+
     # The NCN hostname should have whitespace before it and after it unless
     # it is the end of the line.
-    hostname_regexes = [
-        re.compile(fr'{MGMT_NCN_HOSTNAME_PREFIXES[subrole]}\d{{3}}')
+    hostname_regexes = {
+        subrole: re.compile(fr'{MGMT_NCN_HOSTNAME_PREFIXES[subrole]}\d{{3}}')
         for subrole in subroles
-    ]
+    }
 
     try:
         with open('/etc/hosts', 'r') as f:
@@ -86,16 +116,35 @@ def get_mgmt_ncn_hostnames(subroles):
                 # Strip comments
                 stripped_line = line.split('#', 1)[0]
                 for word in stripped_line.split():
-                    for hostname_regex in hostname_regexes:
+                    for subrole, hostname_regex in hostname_regexes.items():
                         match = hostname_regex.fullmatch(word)
                         if match:
-                            ncn_hostnames.add(word)
+                            ncn_hostnames_by_subrole[subrole].add(word)
 
     except OSError as err:
         LOGGER.error('Unable to read /etc/hosts to obtain management NCN '
                      'hostnames: %s', err)
 
-    return ncn_hostnames
+    return ncn_hostnames_by_subrole
+
+
+def get_mgmt_ncn_hostnames(subroles):
+    """Get a set of management non-compute node (NCN) hostnames.
+
+    The hostnames of the NCNs are parsed from the hosts file on the local host
+    where this is executed.
+
+    Args:
+        subroles (list of str): subroles for which to get hostnames, possible
+            values are keys of `MGMT_NCN_HOSTNAME_PREFIXES`.
+
+    Returns:
+        Set of hostnames for the management NCNs which have the given subroles.
+
+    Raises:
+        ValueError: if given any invalid subroles values
+    """
+    return set().union(*get_mgmt_ncn_hostnames_by_subrole(subroles).values())
 
 
 def k8s_pods_to_status_dict(v1_pod_list):
@@ -141,8 +190,8 @@ def get_mgmt_ncn_groups(excluded_ncns=None):
     """
     excluded_ncns = set() if excluded_ncns is None else excluded_ncns
     ncns_by_subrole = {
-        subrole: sorted(get_mgmt_ncn_hostnames([subrole]))
-        for subrole in MGMT_NCN_HOSTNAME_PREFIXES.keys()
+        subrole: sorted(members)
+        for subrole, members in get_mgmt_ncn_hostnames_by_subrole(list(MGMT_NCN_HOSTNAME_PREFIXES.keys())).items()
     }
     incl_ncns_by_subrole = {}
     excl_ncns_by_subrole = {}
@@ -229,3 +278,93 @@ def get_ssh_client(host_keys=None):
     ssh_client.set_missing_host_key_policy(AutoAddPolicy)
 
     return ssh_client
+
+
+def _ssh_client_is_active(ssh_client):
+    """Check whether an SSH client still has an active connection.
+
+    Args:
+        ssh_client (paramiko.SSHClient): the client to check
+
+    Returns:
+        True if the client's transport is active, False otherwise.
+    """
+    transport = ssh_client.get_transport()
+    return transport is not None and transport.is_active()
+
+
+@contextmanager
+def pooled_ssh(host, host_keys=None):
+    """Get a connected SSH client for a host, reusing an idle one if possible.
+
+    When the context is exited, the client is returned to the pool so that
+    later operations on the same host can reuse its connection instead of
+    connecting again. Clients whose connection is no longer active, or whose
+    context exits with an exception other than a SystemExit with code 0 or
+    None, are closed instead of being returned to the pool.
+
+    Args:
+        host (str): the hostname to connect to
+        host_keys (paramiko.hostkeys.HostKeys): If not None, use the given host
+            keys object when a new connection is needed.
+
+    Yields:
+        A paramiko.SSHClient instance connected to `host`.
+
+    Raises:
+        SSHException, socket.error: if connecting to the host fails.
+    """
+    with _SSH_POOL_LOCK:
+        idle_clients = _SSH_POOL[host]
+        ssh_client = idle_clients.popleft() if idle_clients else None
+
+    if ssh_client is not None and not _ssh_client_is_active(ssh_client):
+        ssh_client.close()
+        ssh_client = None
+
+    if ssh_client is None:
+        LOGGER.debug('Opening new SSH connection to %s', host)
+        ssh_client = get_ssh_client(host_keys=host_keys)
+        try:
+            ssh_client.connect(host, **SSH_CONNECT_KWARGS)
+            transport = ssh_client.get_transport()
+            # Commands run over these connections and their output are small, so
+            # send them immediately rather than letting Nagle's algorithm delay them.
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
+        except Exception:
+            ssh_client.close()
+            raise
+
+    clean_exit = False
+    try:
+        yield ssh_client
+        clean_exit = True
+    except SystemExit as err:
+        # Some callers stop early on success by raising SystemExit(0), which is
+        # treated the same as leaving the context normally.
+        clean_exit = not err.code
+        raise
+    finally:
+        # After any other exception, the body may have left a channel open or
+        # half-read (e.g. after a socket.timeout), so do not hand this
+        # connection to a later caller.
+        if clean_exit and _ssh_client_is_active(ssh_client):
+            with _SSH_POOL_LOCK:
+                _SSH_POOL[host].append(ssh_client)
+        else:
+            ssh_client.close()
+
+
+def close_pooled_ssh_clients():
+    """Close all idle SSH clients in the pool used by `pooled_ssh`.
+
+    Returns:
+        None
+    """
+    with _SSH_POOL_LOCK:
+        idle_clients = [ssh_client for clients in _SSH_POOL.values() for ssh_client in clients]
+        _SSH_POOL.clear()
+
+    for ssh_client in idle_clients:
+        ssh_client.close()
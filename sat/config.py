@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -112,6 +112,21 @@ def validate_cfs_api_version(version):
         )
 
 
+def validate_max_parallel_ssh(value):
+    """Validates the given maximum number of parallel SSH connections
+    Args:
+        value (int): the maximum number of parallel SSH connections to validate
+    Returns:
+        None
+    Raises:
+        ConfigValidationError: if `value` is less than 1
+    """
+    if value < 1:
+        raise ConfigValidationError(
+            f'Maximum number of parallel SSH connections "{value}" must be at least 1.'
+        )
+
+
 SAT_CONFIG_SPEC = {
     'api_gateway': {
         'host': OptionSpec(str, 'api-gw-service-nmn.local', None, None),
@@ -130,6 +145,7 @@ SAT_CONFIG_SPEC = {
     'bootsys': {
         'max_hsn_states': OptionSpec(int, 10, None, None),
         'max_pod_states': OptionSpec(int, 10, None, None),
+        'max_parallel_ssh': OptionSpec(int, 16, validate_max_parallel_ssh, None),
         'bos_templates': OptionSpec(list, [], None, 'bos_templates'),
         'cle_bos_template': OptionSpec(str, '', None, 'cle_bos_template'),
         'uan_bos_template': OptionSpec(str, '', None, 'uan_bos_template')
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2021, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2021, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -29,6 +29,9 @@ import abc
 import fnmatch
 import logging
 import operator
+import re
+from collections import namedtuple
+from functools import lru_cache
 
 import parsec
 
@@ -71,8 +74,45 @@ class BaseFilterFunction(abc.ABC):
         require a recursive implementation.
         """
 
+    def compile(self):
+        """Gets a function which checks whether a row should be included in output.
 
-class ComparisonFilter(BaseFilterFunction):
+        The returned function behaves the same as calling this filter.
+        Subclasses override this to return a function which avoids looking up
+        the state of the filter for every row. Filters which combine other
+        filters compile those filters too, so a whole tree of filters is
+        compiled into a single function.
+
+        Returns:
+            a function which takes a row and returns whether it matches.
+        """
+        return self
+
+
+class CompiledFilter(BaseFilterFunction):
+    """A filter which compiles itself on the first call and calls the result after that."""
+
+    def __init__(self):
+        self._compiled = self._compile_and_call
+
+    def _compile_and_call(self, row):
+        """Compiles this filter, and then checks the row against it."""
+        self._compiled = self.compile()
+        return self._compiled(row)
+
+    def __call__(self, row):
+        return self._compiled(row)
+
+    @abc.abstractmethod
+    def compile(self):
+        """Gets a function which checks whether a row should be included in output.
+
+        This must not return `self`, since calling this filter calls the
+        returned function.
+        """
+
+
+class ComparisonFilter(CompiledFilter):
     def __init__(self, query_key, fields, comparator, cmpr_val):
         """A simple filter composed of a single comparison.
 
@@ -83,10 +123,15 @@ class ComparisonFilter(BaseFilterFunction):
             cmpr_val (str|float): the value against which each column entry is
                 compared
         """
+        super().__init__()
         self._raw_query_key = query_key
         self.fields = fields
         self.comparator = comparator
         self.cmpr_val = cmpr_val
+        # The function used to compare the column value against the comparison
+        # value. This does not depend on the rows, so it is set here rather
+        # than looked up through a property.
+        self.cmpr_fn = _get_cmpr_fn(self.comparator, is_number=isinstance(self.cmpr_val, float))
 
     @cached_property
     def query_key(self):
@@ -96,21 +141,35 @@ class ComparisonFilter(BaseFilterFunction):
         """
         return match_query_key(self._raw_query_key, self.fields)
 
-    @cached_property
-    def cmpr_fn(self):
-        """The function used to compare the column value against the comparison value."""
-        return _get_cmpr_fn(self.comparator, is_number=isinstance(self.cmpr_val, float))
-
-    def __call__(self, row):
-        if self.query_key is None:
-            raise KeyError(self._raw_query_key)
-
-        try:
-            return self.cmpr_fn(row[self.query_key], self.cmpr_val)
-        except TypeError as err:
-            raise TypeError("Cannot filter value of type '{}' with value "
-                            "of type '{}'.".format(type(row[self.query_key]).__name__,
-                                                   type(self.cmpr_val).__name__)) from err
+    def compile(self):
+        # The query key, comparison function and comparison value are bound in
+        # a closure, so they are looked up once rather than for every row.
+        raw_query_key = self._raw_query_key
+        query_key = self.query_key
+        cmpr_fn = self.cmpr_fn
+        cmpr_val = self.cmpr_val
+
+        if query_key is None:
+            def compare(row):
+                raise KeyError(raw_query_key)
+            return compare
+
+        # Equality comparisons never raise TypeError, so they do not need to be
+        # wrapped to give a clearer error message; only ordering comparisons
+        # between incompatible types do.
+        if self.comparator in ('=', '!='):
+            def compare(row):
+                return cmpr_fn(row[query_key], cmpr_val)
+            return compare
+
+        def compare(row):
+            try:
+                return cmpr_fn(row[query_key], cmpr_val)
+            except TypeError as err:
+                raise TypeError("Cannot filter value of type '{}' with value "
+                                "of type '{}'.".format(type(row[query_key]).__name__,
+                                                       type(cmpr_val).__name__)) from err
+        return compare
 
     def get_filtered_fields(self):
         return set() if self.query_key is None else {self.query_key}
@@ -122,7 +181,7 @@ class ComparisonFilter(BaseFilterFunction):
             and self.cmpr_val == other.cmpr_val
 
 
-class CombinedFilter(BaseFilterFunction):
+class CombinedFilter(CompiledFilter):
     def __init__(self, combinator, *filter_fns):
         """Combines multiple filters into one filter.
 
@@ -138,11 +197,65 @@ class CombinedFilter(BaseFilterFunction):
             on an input and combines the results using the given
             combinator.
         """
+        super().__init__()
         self.combinator = combinator
-        self.filter_fns = list(filter_fns)
+        self.filter_fns = filter_fns
 
-    def __call__(self, row):
-        return self.combinator(filter_fn(row) for filter_fn in self.filter_fns)
+    def _flattened_filter_fns(self):
+        """Gets the filters combined by this filter, flattening nested combinations.
+
+        Children which are CombinedFilters with the same combinator as this
+        filter are replaced by their own children, so that, for example,
+        multiple query strings each containing 'and' expressions are combined
+        into a single 'and' of all of their comparisons.
+
+        Returns:
+            list of BaseFilterFunction: the filters to combine.
+        """
+        flattened = []
+        for filter_fn in self.filter_fns:
+            if isinstance(filter_fn, CombinedFilter) and filter_fn.combinator is self.combinator:
+                flattened.extend(filter_fn._flattened_filter_fns())
+            else:
+                flattened.append(filter_fn)
+        return flattened
+
+    def compile(self):
+        combinator = self.combinator
+        if combinator in (all, any):
+            filter_fns = self._flattened_filter_fns()
+        else:
+            filter_fns = self.filter_fns
+        compiled_fns = tuple(filter_fn.compile() for filter_fn in filter_fns)
+
+        # Combining the results of `all` and `any` with explicit short-circuiting
+        # logic avoids creating a generator for every row.
+        if combinator is all and len(compiled_fns) == 2:
+            first, second = compiled_fns
+
+            def combine(row):
+                return bool(first(row) and second(row))
+        elif combinator is any and len(compiled_fns) == 2:
+            first, second = compiled_fns
+
+            def combine(row):
+                return bool(first(row) or second(row))
+        elif combinator is all:
+            def combine(row):
+                for compiled_fn in compiled_fns:
+                    if not compiled_fn(row):
+                        return False
+                return True
+        elif combinator is any:
+            def combine(row):
+                for compiled_fn in compiled_fns:
+                    if compiled_fn(row):
+                        return True
+                return False
+        else:
+            def combine(row):
+                return combinator(compiled_fn(row) for compiled_fn in compiled_fns)
+        return combine
 
     def get_filtered_fields(self):
         return set.union(*(child.get_filtered_fields() for child in self.filter_fns))
@@ -167,21 +280,38 @@ class CustomFilter(BaseFilterFunction):
             returns the result.
         """
         self.filter_fn = filter_fn
-        self.children = children or []
+        self.children = tuple(children) if children else ()
         self.fields = set(fields)
 
     def __call__(self, row):
         return self.filter_fn(row)
 
+    def compile(self):
+        return self.filter_fn
+
     def get_filtered_fields(self):
         return set.union(self.fields, *(child.get_filtered_fields() for child in self.children))
 
 
+@lru_cache(maxsize=256)
+def _compile_wildcard(pattern):
+    """Compiles a wildcard pattern into a case-insensitive regular expression.
+
+    Args:
+        pattern (str): a wildcard pattern as accepted by the fnmatch module.
+
+    Returns:
+        re.Pattern: a regular expression whose `match` method matches the
+            same strings as the wildcard pattern, ignoring case.
+    """
+    return re.compile(fnmatch.translate(pattern.lower()), re.IGNORECASE)
+
+
 def _str_eq_cmpr(name, pattern):
     """Compares name to pattern with wildcards.
 
     Comparison is case insensitive. Pattern matching is based on the
-    fnmatch module.
+    fnmatch module, and the compiled pattern is cached.
 
     Args:
         name (str): some value to check.
@@ -192,8 +322,43 @@ def _str_eq_cmpr(name, pattern):
         bool: True if name matches the pattern after wildcard
             expansion, and False otherwise.
     """
-    return fnmatch.fnmatch(str(name).lower(),
-                           pattern.lower())
+    if not isinstance(name, str):
+        name = str(name)
+    return _compile_wildcard(pattern).match(name) is not None
+
+
+def _str_ne_cmpr(name, pattern):
+    """Checks that name does not match pattern with wildcards.
+
+    This is the negation of _str_eq_cmpr.
+
+    Args:
+        name (str): some value to check.
+        pattern (str): a wildcard pattern which might
+            match name.
+
+    Returns:
+        bool: False if name matches the pattern after wildcard
+            expansion, and True otherwise.
+    """
+    return not _str_eq_cmpr(name, pattern)
+
+
+# The comparator functions for each comparison symbol, built once rather than
+# for each comparison parsed.
+_NUMBER_CMPR_FNS = {
+    '>':  operator.gt,
+    '>=': operator.ge,
+    '<':  operator.lt,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '=':  operator.eq,
+}
+_STRING_CMPR_FNS = {
+    **_NUMBER_CMPR_FNS,
+    '!=': _str_ne_cmpr,
+    '=':  _str_eq_cmpr,
+}
 
 
 def _get_cmpr_fn(fn_sym, is_number=False):
@@ -217,190 +382,236 @@ def _get_cmpr_fn(fn_sym, is_number=False):
     Raises:
         ValueError: if fn_sym is not a valid operator.
     """
-    fns = {
-        '>':   operator.gt,
-        '>=':  operator.ge,
-        '<':   operator.lt,
-        '<=':  operator.le,
-        '!=': (operator.ne if is_number
-               else lambda n, p: not _str_eq_cmpr(n, p)),
-        '=':  (operator.eq if is_number
-               else _str_eq_cmpr)
-    }
+    fns = _NUMBER_CMPR_FNS if is_number else _STRING_CMPR_FNS
 
     if fn_sym not in fns:
         raise ValueError('Invalid comparison symbol')
 
-    return fns.get(fn_sym)
+    return fns[fn_sym]
 
 
-def parse_query_string(query_string, fields):
-    """Compiles a query string into a function for filtering rows.
+# The parsed form of a query string. A query string is parsed into a tree of
+# these, which does not depend on the fields being filtered, so that parsing
+# can be cached and the tree used to build filters against any fields.
+_Comparison = namedtuple('_Comparison', ['query_key', 'comparator', 'cmpr_val'])
+_Combination = namedtuple('_Combination', ['combinator', 'lhs', 'rhs'])
 
-    If query_string is invalid, ParseError is raised.
+
+_whitespace = parsec.regex(r'\s*')
+
+
+def _lexeme(p):
+    """Creates subparsers (potentially) surrounded by whitespace.
 
     Args:
-        query_string: a string against which the rows should be
-            filtered
-        fields: a list of strings indicating which fields this
-            filter may filter against
+        p: a parsec.Parser object
 
     Returns:
-        a function which returns True if a given row matches
-        the query string, and False otherwise.
+        a parser which is followed by optional whitespace.
+    """
+    return p << _whitespace
 
-    Raises:
-        ParseError: if query_string is not a valid query.
+
+_tok_dq = _lexeme(parsec.string('"'))
+_tok_sq = _lexeme(parsec.string('\''))
+_tok_and = _lexeme(parsec.string('and'))
+_tok_or = _lexeme(parsec.string('or'))
+_tok_cmpr = _lexeme(parsec.regex(COMPARATOR_RE))
+_tok_lhs = _lexeme(parsec.regex(r'[a-zA-Z_\-0-9]+'))
+_tok_end = _lexeme(parsec.regex(r'$'))
+_tok_rhs_content = _lexeme(parsec.regex(r'\S+'))
+
+
+@_lexeme
+@parsec.generate
+def _tok_double_quoted_str():
+    """Parses a double-quoted string.
+
+    Double-quoted strings can contain any non-double-quote
+    character.
+
+    Returns:
+        a string containing the contents of the quoted string.
     """
+    yield _tok_dq
+    content = yield parsec.regex(r'[^"]*')
+    yield _tok_dq
 
-    def lexeme(p):
-        """Creates subparsers (potentially) surrounded by whitespace.
+    return content
 
-        Args:
-            p: a parsec.Parser object
 
-        Returns:
-            a parser which is followed by optional whitespace.
-        """
-        whitespace = parsec.regex(r'\s*')
-        return p << whitespace
+@_lexeme
+@parsec.generate
+def _tok_single_quoted_str():
+    """Parses a single-quoted string.
 
-    tok_dq = lexeme(parsec.string('"'))
-    tok_sq = lexeme(parsec.string('\''))
-    tok_and = lexeme(parsec.string('and'))
-    tok_or = lexeme(parsec.string('or'))
-    tok_cmpr = lexeme(parsec.regex(COMPARATOR_RE))
-    tok_lhs = lexeme(parsec.regex(r'[a-zA-Z_\-0-9]+'))
-    tok_end = lexeme(parsec.regex(r'$'))
+    Single-quoted strings can contain any non-single-quote
+    character.
 
-    @lexeme
-    @parsec.generate
-    def tok_double_quoted_str():
-        """Parses a double-quoted string.
+    Returns:
+        a string containing the contents of the quoted string.
+    """
+    yield _tok_sq
+    content = yield parsec.regex(r'[^\']*')
+    yield _tok_sq
 
-        Double-quoted strings can contain any non-double-quote
-        character.
+    return content
 
-        Returns:
-            a string containing the contents of the quoted string.
-        """
-        yield tok_dq
-        content = yield parsec.regex(r'[^"]*')
-        yield tok_dq
 
-        return content
+_tok_quoted_str = _tok_double_quoted_str ^ _tok_single_quoted_str
 
-    @lexeme
-    @parsec.generate
-    def tok_single_quoted_str():
-        """Parses a single-quoted string.
 
-        Single-quoted strings can contain any non-single-quote
-        character.
+@_lexeme
+@parsec.generate
+def _tok_rhs():
+    """Parse the right hand side of an expression.
 
-        Returns:
-            a string containing the contents of the quoted string.
-        """
-        yield tok_sq
-        content = yield parsec.regex(r'[^\']*')
-        yield tok_sq
+    The right hand side can be a number or some wildcard. Numbers
+    are parsed into floats, and wildcards are returned as
+    strings. These are handled separately from quoted strings,
+    which are always interpreted as strings.
 
+    Returns:
+         a float if the value can be parsed as a number, or a
+         string otherwise.
+    """
+    content = yield _tok_rhs_content
+    try:
+        return float(content)
+    except ValueError:
         return content
 
-    tok_quoted_str = tok_double_quoted_str ^ tok_single_quoted_str
 
-    @lexeme
-    @parsec.generate
-    def tok_rhs():
-        """Parse the right hand side of an expression.
+@parsec.generate
+def _comparison():
+    r"""Parses a comparison expression (e.g. 'foo=bar')
 
-        The right hand side can be a number or some wildcard. Numbers
-        are parsed into floats, and wildcards are returned as
-        strings. These are handled separately from quoted strings,
-        which are always interpreted as strings.
+    Comparison expressions have the following grammar, in pseudo-BNF:
+        <ident> ::= tok_lhs
+        <single_quoted_str> ::= ' <str> '
+        <double_quoted_str> ::= " <str> "
+        <wildcard> ::= tok_rhs
+        <num> ::= FLOAT_RE
+        <comparator> ::= '>=' | '>' | '<' | '<=' | '=' | '!='
+        <cmpr_val> ::= <wildcard> | <num>
+        <comparison> ::= <ident> <comparator> <cmpr_val>
 
-        Returns:
-             a float if the value can be parsed as a number, or a
-             string otherwise.
-        """
-        content = yield lexeme(parsec.regex(r'\S+'))
-        try:
-            return float(content)
-        except ValueError:
-            return content
-
-    @parsec.generate
-    def comparison():
-        r"""Parses a comparison expression (e.g. 'foo=bar')
-
-        Comparison expressions have the following grammar, in pseudo-BNF:
-            <ident> ::= tok_lhs
-            <single_quoted_str> ::= ' <str> '
-            <double_quoted_str> ::= " <str> "
-            <wildcard> ::= tok_rhs
-            <num> ::= FLOAT_RE
-            <comparator> ::= '>=' | '>' | '<' | '<=' | '=' | '!='
-            <cmpr_val> ::= <wildcard> | <num>
-            <comparison> ::= <ident> <comparator> <cmpr_val>
-
-        If the given value is a string, then the value in the
-        row will be filtered using fnmatch.fnmatch (i.e.,
-        wildcards will be expanded.) If the value is instead a
-        number, a numerical comparison will be used.
+    If the given value is a string, then the value in the
+    row will be filtered using fnmatch.fnmatch (i.e.,
+    wildcards will be expanded.) If the value is instead a
+    number, a numerical comparison will be used.
 
-        Returns:
-            a function which can filter rows according to the
-            comparison sub-expression which this parser parses.
-        """
-        # TODO: It might be a "good" idea in the future to refactor
-        # the grammar a little bit to enforce types on certain
-        # comparisons (e.g., only allow comparisons to numbers for
-        # greater-than or less-than), but if this doesn't turn out to
-        # be an issue, it probably isn't all that necessary.
-        query_key = yield (tok_lhs ^ tok_quoted_str)
-        comparator = yield tok_cmpr
-        cmpr_val = yield (tok_quoted_str ^ tok_rhs)
+    Returns:
+        a _Comparison representing the comparison sub-expression
+        which this parser parses.
+    """
+    # TODO: It might be a "good" idea in the future to refactor
+    # the grammar a little bit to enforce types on certain
+    # comparisons (e.g., only allow comparisons to numbers for
+    # greater-than or less-than), but if this doesn't turn out to
+    # be an issue, it probably isn't all that necessary.
+    query_key = yield (_tok_lhs ^ _tok_quoted_str)
+    comparator = yield _tok_cmpr
+    cmpr_val = yield (_tok_quoted_str ^ _tok_rhs)
 
-        return ComparisonFilter(query_key, fields, comparator, cmpr_val)
+    return _Comparison(query_key, comparator, cmpr_val)
 
-    @parsec.generate
-    def bool_and_expr():
-        """Parses an 'and' expression. (e.g. 'foo = bar and baz > 10')
 
-        Returns:
-            Result of boolean and-operation.
-        """
-        lhs = yield comparison
-        yield tok_and
-        rhs = yield (bool_and_expr ^ comparison)
-        return CombinedFilter(all, lhs, rhs)
+@parsec.generate
+def _bool_and_expr():
+    """Parses an 'and' expression. (e.g. 'foo = bar and baz > 10')
 
-    @parsec.generate
-    def bool_expr():
-        """Parses a boolean expression with operators: and, or.
+    Returns:
+        a _Combination representing the boolean and-operation.
+    """
+    lhs = yield _comparison
+    yield _tok_and
+    rhs = yield (_bool_and_expr ^ _comparison)
+    return _Combination(all, lhs, rhs)
 
-        Returns:
-            Result of boolean operation.
-        """
-        lhs = yield (bool_and_expr ^ comparison)
-        oper = yield (tok_or | tok_and | tok_end)
-        if oper not in ['and', 'or']:
-            return lhs
-        rhs = yield (bool_expr ^ comparison)
-        return CombinedFilter(all if oper == 'and' else any, lhs, rhs)
 
-    # Expressions can either be a boolean expression composing >= 2
-    # comparisons, or just a single comparison.
-    expr = bool_expr ^ comparison
+@parsec.generate
+def _bool_expr():
+    """Parses a boolean expression with operators: and, or.
+
+    Returns:
+        a _Combination representing the boolean operation, or a
+        _Comparison if there is no boolean operator.
+    """
+    lhs = yield (_bool_and_expr ^ _comparison)
+    oper = yield (_tok_or | _tok_and | _tok_end)
+    if oper not in ['and', 'or']:
+        return lhs
+    rhs = yield (_bool_expr ^ _comparison)
+    return _Combination(all if oper == 'and' else any, lhs, rhs)
+
+
+# Expressions can either be a boolean expression composing >= 2
+# comparisons, or just a single comparison.
+_expr = _bool_expr ^ _comparison
+
+
+@lru_cache(maxsize=256)
+def _parse_query_tree(query_string):
+    """Parses a query string into a tree of comparisons and combinations.
+
+    The result is cached, so repeated queries are only parsed once.
+
+    Args:
+        query_string (str): the query string to parse
+
+    Returns:
+        _Comparison or _Combination: the root of the parsed query
+
+    Raises:
+        ParseError: if query_string is not a valid query.
+    """
+    return _expr.parse_strict(query_string)
 
-    return expr.parse_strict(query_string)
+
+def _build_filter(node, fields):
+    """Builds a filter function from a parsed query.
+
+    Args:
+        node (_Comparison or _Combination): the root of the parsed query
+        fields: a list of strings indicating which fields the filter may
+            filter against
+
+    Returns:
+        a BaseFilterFunction which implements the parsed query.
+    """
+    if isinstance(node, _Combination):
+        return CombinedFilter(node.combinator, _build_filter(node.lhs, fields),
+                              _build_filter(node.rhs, fields))
+    return ComparisonFilter(node.query_key, fields, node.comparator, node.cmpr_val)
+
+
+def parse_query_string(query_string, fields):
+    """Compiles a query string into a function for filtering rows.
+
+    If query_string is invalid, ParseError is raised.
+
+    Args:
+        query_string: a string against which the rows should be
+            filtered
+        fields: a list of strings indicating which fields this
+            filter may filter against
+
+    Returns:
+        a function which returns True if a given row matches
+        the query string, and False otherwise.
+
+    Raises:
+        ParseError: if query_string is not a valid query.
+    """
+    return _build_filter(_parse_query_tree(query_string), fields)
 
 
 def parse_multiple_query_strings(query_strings, fields, filter_fns=None):
     """Helper function to parse and combine query strings and functions.
 
     All filter functions passed in and built from the given query strings are
-    combined with a boolean "and".
+    combined with a boolean "and". Duplicate query strings are only used once.
 
     Args:
         query_strings ([str]): filter strings to be parsed and combined.
@@ -418,8 +629,11 @@ def parse_multiple_query_strings(query_strings, fields, filter_fns=None):
     if filter_fns is None:
         filter_fns = []
 
+    # Each query string's parsing is cached by parse_query_string, and since
+    # the filters are combined with "and", repeated query strings only need to
+    # be checked once for each row.
     all_filter_fns = [parse_query_string(query_string, fields)
-                      for query_string in query_strings] + filter_fns
+                      for query_string in dict.fromkeys(query_strings)] + list(filter_fns)
 
     if not all_filter_fns:
         return None
@@ -444,13 +658,14 @@ def remove_constant_values(dicts, constant_value, protect=None):
 
     Returns:
         A list of dicts with keys removed from all dicts if that key has the
-        given `constant_value` across all the dicts.
+        given `constant_value` across all the dicts. If no keys are removed,
+        the list contains the given dicts rather than copies of them.
     """
     if not dicts:
         return []
 
     # All dicts are assumed to have the same keys and type
-    keys = dicts[0].keys()
+    keys = list(dicts[0].keys())
 
     # This is to preserve OrderedDict if given.
     dict_type = type(dicts[0])
@@ -458,9 +673,20 @@ def remove_constant_values(dicts, constant_value, protect=None):
     if protect is None:
         protect = set()
 
+    # Transpose the rows into one tuple of values per key, so that each key's
+    # values can be checked without looking the key up in every dict.
+    # operator.itemgetter only returns a tuple when given more than one key.
+    if len(keys) > 1:
+        columns = zip(*map(operator.itemgetter(*keys), dicts))
+    else:
+        columns = [tuple(d[key] for d in dicts) for key in keys]
+
     keys_to_keep = []
-    for key in keys:
-        if all(d[key] == constant_value for d in dicts):
+    for key, column in zip(keys, columns):
+        # Counting in C is faster than comparing each value in a generator,
+        # but it cannot stop at the first value that differs, so first check
+        # the first value to quickly rule out most columns.
+        if column[0] == constant_value and column.count(constant_value) == len(column):
             if key in protect:
                 LOGGER.debug("All values for '%s' are '%s', but '%s' is a protected "
                              "key. Not discarding.", key, constant_value, key)
@@ -471,5 +697,9 @@ def remove_constant_values(dicts, constant_value, protect=None):
 
         keys_to_keep.append(key)
 
-    return [dict_type([(key, d[key]) for key in keys_to_keep])
+    # Nothing needs to be rebuilt if no keys were removed.
+    if len(keys_to_keep) == len(keys):
+        return list(dicts)
+
+    return [dict_type((key, d[key]) for key in keys_to_keep)
             for d in dicts]
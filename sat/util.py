@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -28,7 +28,7 @@ from json.encoder import JSONEncoder
 import sys
 from collections import OrderedDict
 from datetime import timedelta
-from functools import partial
+from functools import lru_cache, partial
 from getpass import getpass
 import logging
 import math
@@ -755,6 +755,34 @@ def is_subsequence(needle, haystack):
         return not needle
 
 
+@lru_cache(maxsize=1024)
+def _find_query_key_matches(query_key, headings):
+    """Finds the headings matched by some user-supplied query.
+
+    Args:
+        query_key (str): a string containing some key we want to match
+        headings (tuple): the headings to match against
+
+    Returns:
+        tuple: a tuple containing just the first heading which is an exact
+            match for query_key if there is one, or otherwise all the headings
+            of which query_key is a subsequence.
+    """
+    lower_query_key = query_key.lower()
+
+    # Return the first exact match if there is one
+    for key in headings:
+        if key.lower() == lower_query_key:
+            return (key,)
+
+    # We want to be able to match on just the subsequence of
+    # query_key, since keys can be somewhat long or have extraneous
+    # info (e.g. units etc.) that we don't want the user to worry
+    # about.
+    return tuple(key for key in headings
+                 if is_subsequence(lower_query_key, key.lower()))
+
+
 def match_query_key(query_key, headings):
     """Computes the underlying key from some user-supplied query.
 
@@ -764,6 +792,9 @@ def match_query_key(query_key, headings):
     first heading is returned and a WARNING is printed.
     Otherwise, None is returned.
 
+    Matching is cached for each query_key and sequence of headings, since
+    the same keys are often matched repeatedly against the same headings.
+
     Args:
         query_key: a string containing some key we want to match
         headings: an iterable containing various headings
@@ -771,24 +802,13 @@ def match_query_key(query_key, headings):
     Returns:
         The unique key matching query_key or None.
     """
-
-    # Return the first exact match if there is one
-    for key in headings:
-        if key.lower() == query_key.lower():
-            return key
-
-    # We want to be able to match on just the subsequence of
-    # query_key, since keys can be somewhat long or have extraneous
-    # info (e.g. units etc.) that we don't want the user to worry
-    # about.
-    matching_keys = [key for key in headings
-                     if is_subsequence(query_key.lower(), key.lower())]
+    matching_keys = _find_query_key_matches(query_key, tuple(headings))
     if not matching_keys:
         return None
 
     if len(matching_keys) != 1:
         LOGGER.warning(f"Heading '{query_key}' is ambiguous. "
-                       f"Using first match: '{matching_keys[0]}' from {tuple(matching_keys)}.")
+                       f"Using first match: '{matching_keys[0]}' from {matching_keys}.")
 
     return matching_keys[0]
 
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020-2022, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020-2022, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -65,16 +65,25 @@ class Waiter(metaclass=abc.ABCMeta):
     Attributes:
         timeout (int): the timeout, in seconds, for the wait operation
         poll_interval (int): the interval, in seconds, between polls for
-            completion.
+            completion. If `poll_backoff` is greater than 1, this is the
+            interval before the second poll.
+        poll_backoff (float): the factor by which the interval between polls
+            is multiplied after each poll. By default, this is 1, meaning the
+            interval does not change.
+        max_poll_interval (int or float or None): the maximum interval, in
+            seconds, between polls when `poll_backoff` is greater than 1. If
+            None, the interval is not limited.
         completed (bool): True if the condition has been met, False otherwise.
         retries (int): the number of times waiting may be retried. By default,
             this is 0, meaning the wait will only occur once.
         failed (bool): True if there was an irrecoverable failure waiting
             for the condition, False if waiting did not have issues.
     """
-    def __init__(self, timeout, poll_interval=1, retries=0):
+    def __init__(self, timeout, poll_interval=1, retries=0, poll_backoff=1, max_poll_interval=None):
         self.timeout = timeout
         self.poll_interval = poll_interval
+        self.poll_backoff = poll_backoff
+        self.max_poll_interval = max_poll_interval
         self.completed = False
         self.failed = False
         self._waiter_thread = None
@@ -141,6 +150,7 @@ class Waiter(metaclass=abc.ABCMeta):
         outside this module.
         """
         start_time = time.monotonic()
+        poll_interval = self.poll_interval
         while time.monotonic() - start_time < self.timeout:
             self.on_check_action()
 
@@ -150,7 +160,10 @@ class Waiter(metaclass=abc.ABCMeta):
             if self.completed:
                 break
 
-            time.sleep(self.poll_interval)
+            time.sleep(poll_interval)
+            poll_interval *= self.poll_backoff
+            if self.max_poll_interval is not None:
+                poll_interval = min(poll_interval, self.max_poll_interval)
 
     def wait_for_completion(self):
         """Wait for the condition to be achieved or for timeout.
@@ -285,7 +298,14 @@ class GroupWaiter(Waiter):
         members (set): a set of members of an arbitrary type to wait for.
         timeout (int): the timeout, in seconds, for the wait operation
         poll_interval (int): the interval, in seconds, between polls for
-            completion.
+            completion. If `poll_backoff` is greater than 1, this is the
+            interval before the second poll.
+        poll_backoff (float): the factor by which the interval between polls
+            is multiplied after each poll. By default, this is 1, meaning the
+            interval does not change.
+        max_poll_interval (int or float or None): the maximum interval, in
+            seconds, between polls when `poll_backoff` is greater than 1. If
+            None, the interval is not limited.
         retries (int): the number of times waiting may be retried. By default,
             this is 0, meaning the wait will only occur once.
         failed (set): contains members which cannot be waited for, or
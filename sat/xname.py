@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2022 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2022, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -261,12 +261,24 @@ def get_matches(filters, elems):
     matches = set()
     no_matches = set(elems)
 
+    # A filter contains an element if the filter's tokens are a prefix of the
+    # element's tokens, so index the filters by their tokens and look up each
+    # prefix of each element rather than checking every filter against every
+    # element.
+    filters_by_tokens = {}
+    for filter_ in filters:
+        filters_by_tokens.setdefault(filter_.tokens, []).append(filter_)
+
     for elem in elems:
-        for filter_ in filters:
-            if filter_.contains_component(elem):
-                used.add(filter_)
-                unused.discard(filter_)
-                matches.add(elem)
-                no_matches.discard(elem)
+        elem_tokens = elem.tokens
+        # Start with the empty prefix, since a filter with no tokens, e.g. one
+        # made from a string with no digits, contains every element.
+        for prefix_len in range(len(elem_tokens) + 1):
+            for filter_ in filters_by_tokens.get(elem_tokens[:prefix_len], ()):
+                if filter_.contains_component(elem):
+                    used.add(filter_)
+                    unused.discard(filter_)
+                    matches.add(elem)
+                    no_matches.discard(elem)
 
     return used, unused, matches, no_matches
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021, 2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021, 2023, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -30,8 +30,8 @@ from unittest import mock
 
 from paramiko import SSHException
 
-from sat.cli.bootsys.etcd import (EtcdInactiveFailure, EtcdSnapshotFailure,
-                                  save_etcd_snapshot_on_host)
+from sat.cli.bootsys.etcd import (ETCD_COMMAND_TIMEOUT, EtcdInactiveFailure,
+                                  EtcdSnapshotFailure, save_etcd_snapshot_on_host)
 
 
 class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
@@ -40,10 +40,12 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
     def setUp(self):
         """Set up some mocks."""
         self.hostname = 'ncn-m001'
-        self.mock_get_ssh_client = mock.patch('sat.cli.bootsys.etcd.get_ssh_client').start()
-        self.mock_ssh_client = self.mock_get_ssh_client.return_value
+        self.mock_pooled_ssh = mock.patch('sat.cli.bootsys.etcd.pooled_ssh').start()
+        self.mock_ssh_client = self.mock_pooled_ssh.return_value.__enter__.return_value
         # Whether the corresponding exec_command should raise SSHException
         self.systemctl_raises = False
+        # Whether reading the output of the etcdctl command should time out
+        self.etcdctl_read_times_out = False
         self.mkdir_raises = False
         self.etcdctl_raises = False
         # Exit status for corresponding exec_command
@@ -54,7 +56,7 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
         self.stderr_str = 'error'
         self.stdout_str = 'output'
 
-        def fake_exec_command(cmd):
+        def fake_exec_command(cmd, timeout=None):
             if "systemctl" in cmd:
                 should_raise = self.systemctl_raises
                 exit_status = self.systemctl_exit_status
@@ -73,9 +75,11 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
 
             fake_stdout = mock.Mock()
             fake_stdout.channel.recv_exit_status.return_value = exit_status
-            fake_stdout.read.return_value = self.stdout_str
+            fake_stdout.read.return_value = self.stdout_str.encode()
+            if "etcdctl" in cmd and self.etcdctl_read_times_out:
+                fake_stdout.read.side_effect = socket.timeout('timed out')
             fake_stderr = mock.Mock()
-            fake_stderr.read.return_value = self.stderr_str
+            fake_stderr.read.return_value = self.stderr_str.encode()
 
             return mock.Mock(), fake_stdout, fake_stderr
 
@@ -85,21 +89,29 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
         mock.patch.stopall()
 
     def assert_ssh_client_connect(self):
-        """Assert the SSHClient was created and connected to the hostname."""
-        self.mock_get_ssh_client.assert_called_once()
-        self.mock_ssh_client.connect.assert_called_once_with(self.hostname)
+        """Assert an SSHClient connected to the hostname was taken from the pool."""
+        self.mock_pooled_ssh.assert_called_once_with(self.hostname, host_keys=None)
+        self.mock_pooled_ssh.return_value.__enter__.assert_called_once()
+
+    def assert_ssh_client_released(self, exc_type=None):
+        """Assert the SSHClient context was exited, with an exception of the given type if any."""
+        mock_exit = self.mock_pooled_ssh.return_value.__exit__
+        mock_exit.assert_called_once()
+        # The last three arguments are the type, value and traceback of any exception
+        self.assertEqual(exc_type, mock_exit.call_args.args[-3])
 
     def assert_exec_commands(self):
         """Assert the appropriate exec_command calls were made on the SSHClient."""
-        expected_calls = [mock.call('systemctl is-active etcd')]
+        expected_calls = [mock.call('systemctl is-active etcd', timeout=ETCD_COMMAND_TIMEOUT)]
         if not (self.systemctl_raises or self.systemctl_exit_status):
-            expected_calls.append(mock.call('mkdir -p /root/etcd_backup'))
+            expected_calls.append(mock.call('mkdir -p /root/etcd_backup', timeout=ETCD_COMMAND_TIMEOUT))
             if not (self.mkdir_raises or self.mkdir_exit_status):
                 expected_calls.append(mock.call(
                     'ETCDCTL_API=3 etcdctl --cacert /etc/kubernetes/pki/etcd/ca.crt '
                     '--cert /etc/kubernetes/pki/etcd/peer.crt '
                     '--key /etc/kubernetes/pki/etcd/peer.key '
-                    'snapshot save /root/etcd_backup/backup.db'
+                    'snapshot save /root/etcd_backup/backup.db',
+                    timeout=ETCD_COMMAND_TIMEOUT
                 ))
 
         self.mock_ssh_client.exec_command.assert_has_calls(expected_calls)
@@ -111,9 +123,46 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
         self.assert_ssh_client_connect()
         self.assert_exec_commands()
 
+    def test_save_etcd_snapshot_ssh_client_released(self):
+        """Test that the SSHClient is returned to the pool after saving an etcd snapshot."""
+        save_etcd_snapshot_on_host(self.hostname)
+        self.assert_ssh_client_released()
+
+    def test_save_etcd_snapshot_ssh_client_released_on_failure(self):
+        """Test that the SSHClient is returned to the pool when a snapshot command exits non-zero."""
+        self.etcdctl_exit_status = 1
+        with self.assertRaises(EtcdSnapshotFailure):
+            save_etcd_snapshot_on_host(self.hostname)
+        self.assert_ssh_client_released()
+
+    def test_save_etcd_snapshot_ssh_client_released_etcd_inactive(self):
+        """Test that the SSHClient is returned to the pool when etcd is inactive."""
+        self.systemctl_exit_status = 3
+        with self.assertRaises(EtcdInactiveFailure):
+            save_etcd_snapshot_on_host(self.hostname)
+        self.assert_ssh_client_released()
+
+    def test_save_etcd_snapshot_ssh_client_discarded_on_ssh_exception(self):
+        """Test that the SSHClient context is exited with an exception when a command fails to execute."""
+        self.etcdctl_raises = True
+        with self.assertRaises(EtcdSnapshotFailure):
+            save_etcd_snapshot_on_host(self.hostname)
+        self.assert_ssh_client_released(EtcdSnapshotFailure)
+
+    def test_save_etcd_snapshot_etcdctl_read_timeout(self):
+        """Test saving an etcd snapshot when reading the etcdctl output times out."""
+        self.etcdctl_read_times_out = True
+        err_regex = f'Failed to execute ".* etcdctl .* snapshot save .*" on {self.hostname}: timed out'
+
+        with self.assertRaisesRegex(EtcdSnapshotFailure, err_regex):
+            save_etcd_snapshot_on_host(self.hostname)
+
+        self.assert_exec_commands()
+        self.assert_ssh_client_released(EtcdSnapshotFailure)
+
     def test_save_etcd_snapshot_ssh_exception(self):
         """Test saving an etcd snapshot on a host when connect raises SSHException."""
-        self.mock_ssh_client.connect.side_effect = SSHException
+        self.mock_pooled_ssh.return_value.__enter__.side_effect = SSHException
 
         with self.assertRaisesRegex(EtcdSnapshotFailure, f'Failed to connect to {self.hostname}'):
             save_etcd_snapshot_on_host(self.hostname)
@@ -123,7 +172,7 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
 
     def test_save_etcd_snapshot_socket_error(self):
         """Test saving an etcd snapshot on a host when connect raises a socket.error."""
-        self.mock_ssh_client.connect.side_effect = socket.error
+        self.mock_pooled_ssh.return_value.__enter__.side_effect = socket.error
 
         with self.assertRaisesRegex(EtcdSnapshotFailure, f'Failed to connect to {self.hostname}'):
             save_etcd_snapshot_on_host(self.hostname)
@@ -190,7 +239,7 @@ class TestSaveEtcdSnapshotOnHost(unittest.TestCase):
         """Test saving an etcd snapshot when etcdctl command exits non-zero."""
         self.etcdctl_exit_status = 1
         err_regex = (f'Command ".* etcdctl .* snapshot save .*" on {self.hostname} '
-                     f'exited with non-zero exit status')
+                     f'exited with non-zero exit status: 1, stderr: error, stdout: output')
 
         with self.assertRaisesRegex(EtcdSnapshotFailure, err_regex):
             save_etcd_snapshot_on_host(self.hostname)
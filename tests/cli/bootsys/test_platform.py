@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021, 2023, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021, 2023, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,21 +26,26 @@ Unit tests for the sat.cli.bootsys.platform module.
 """
 import logging
 import socket
-import threading
 import unittest
 from argparse import Namespace
 from contextlib import contextmanager
 from unittest import mock
-from multiprocessing import Process, Queue
+from queue import Queue
 import queue
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
 
 from paramiko import SSHException
 
 from sat.cli.bootsys.ceph import CephHealthCheckError
 from sat.cli.bootsys.etcd import EtcdInactiveFailure, EtcdSnapshotFailure
-from sat.cli.bootsys.platform import (CONTAINER_STOP_SCRIPT,
+from sat.cli.bootsys.platform import (CONTAINER_STOP_COMMAND_TIMEOUT,
+                                      CONTAINER_STOP_SCRIPT,
+                                      SERVICE_ACTION_COMMAND_TIMEOUT,
                                       SERVICE_ACTION_TIMEOUT,
-                                      ContainerStopProcess, FatalPlatformError,
+                                      SERVICE_SETTLE_CHECKS,
+                                      SERVICE_SETTLE_INTERVAL,
+                                      ContainerStopper, FatalPlatformError,
                                       NonFatalPlatformError,
                                       PlatformServicesStep,
                                       RemoteServiceWaiter, do_ceph_freeze,
@@ -50,28 +55,33 @@ from sat.cli.bootsys.platform import (CONTAINER_STOP_SCRIPT,
                                       do_platform_stop,
                                       do_service_action_on_hosts,
                                       do_stop_containers)
-from sat.cli.bootsys.util import FatalBootsysError
+from sat.cli.bootsys.util import FatalBootsysError, close_pooled_ssh_clients
 
 
-class TestContainerStopProcess(unittest.TestCase):
-    """Test the ContainerStopProcess class."""
+class TestContainerStopper(unittest.TestCase):
+    """Test the ContainerStopper class."""
 
     def setUp(self):
-        """Set up some mocks and a ContainerStopProcess"""
+        """Set up some mocks and a ContainerStopper"""
         self.host = 'ncn-w001'
-        self.get_ssh_client = mock.patch('sat.cli.bootsys.platform.get_ssh_client').start()
-        self.ssh_client = self.get_ssh_client.return_value
+        self.mock_pooled_ssh = mock.patch('sat.cli.bootsys.platform.pooled_ssh').start()
+        self.ssh_client = self.mock_pooled_ssh.return_value.__enter__.return_value
         # Replace sleep with a Mock to decrease the execution time of tests
         self.mock_sleep = mock.patch('time.sleep').start()
         self.result_queue = Queue()
-        self.csp = ContainerStopProcess(self.host, result_queue=self.result_queue)
+        self.host_keys = mock.Mock()
+        self.csp = ContainerStopper(self.host, host_keys=self.host_keys, result_queue=self.result_queue)
 
     def tearDown(self):
         mock.patch.stopall()
 
     def assert_ssh_connected(self):
-        """Assert the SSHClient is created and connected."""
-        self.ssh_client.connect.assert_called_once_with(self.host)
+        """Assert the SSHClient is taken from the pool and given back."""
+        self.mock_pooled_ssh.assert_called_once_with(self.host, host_keys=self.host_keys)
+        mock_exit = self.mock_pooled_ssh.return_value.__exit__
+        mock_exit.assert_called_once()
+        # The context is left normally, not by an exception, so the client is pooled
+        self.assertEqual((None, None, None), mock_exit.call_args.args[-3:])
 
     @contextmanager
     def assert_exits_with_err(self, err_msg, log_level=logging.ERROR):
@@ -93,7 +103,7 @@ class TestContainerStopProcess(unittest.TestCase):
             # We have to use a blocking call with a small timeout. See https://bugs.python.org/issue20147
             host, success = self.result_queue.get(timeout=0.01)
         except queue.Empty:
-            self.fail('Expected a failure result from ContainerStopProcess '
+            self.fail('Expected a failure result from ContainerStopper '
                       'but received no results.')
 
         self.assertEqual(self.host, host)
@@ -123,7 +133,7 @@ class TestContainerStopProcess(unittest.TestCase):
             # We have to use a blocking call with a small timeout. See https://bugs.python.org/issue20147
             host, success = self.result_queue.get(timeout=0.01)
         except queue.Empty:
-            self.fail('Expected a successful result from ContainerStopProcess '
+            self.fail('Expected a successful result from ContainerStopper '
                       'but received no results.')
 
         self.assertEqual(self.host, host)
@@ -136,8 +146,9 @@ class TestContainerStopProcess(unittest.TestCase):
         self.assertEqual(0, raises_cm.exception.code)
 
     def test_init(self):
-        """Test the creation of a new ContainerStopProcess."""
+        """Test the creation of a new ContainerStopper."""
         self.assertEqual(self.host, self.csp.host)
+        self.assertIsNone(self.csp.ssh_client)
         # Result queue should be empty before run is called
         with self.assertRaises(queue.Empty):
             self.result_queue.get(block=False)
@@ -154,34 +165,32 @@ class TestContainerStopProcess(unittest.TestCase):
         with self.assert_exits_successfully(info_msg):
             self.csp._success_exit(info_msg)
 
-    def test_ssh_client_success(self):
-        """Test the ssh_client property of ContainerStopProcess."""
-        ssh_client = self.csp.ssh_client
-        self.assertEqual(self.ssh_client, ssh_client)
-        self.assert_ssh_connected()
-        # Check that the property is cached by accessing it again and verifying
-        # that the SSHClient and its methods are not called again.
-        _ = self.csp.ssh_client
-        # The below assertion uses assert_called_once_with, which will fail if
-        # methods are called multiple times.
+    def test_run_uses_pooled_ssh_client(self):
+        """Test that run uses an SSH client from the pool and gives it back."""
+        with mock.patch.object(self.csp, '_run_remote_command') as mock_run_command:
+            mock_run_command.return_value = 3, 'inactive', ''
+            with self.assertRaises(SystemExit):
+                self.csp.run()
+
+        self.assertEqual(self.ssh_client, self.csp.ssh_client)
         self.assert_ssh_connected()
 
-    def test_ssh_client_ssh_exception(self):
-        """Test the ssh_client property when SSHException is raised by connect."""
-        self.ssh_client.connect.side_effect = SSHException('ssh failed')
+    def test_run_connect_ssh_exception(self):
+        """Test run when SSHException is raised while connecting."""
+        self.mock_pooled_ssh.return_value.__enter__.side_effect = SSHException('ssh failed')
 
         with self.assert_exits_with_err(f'Failed to connect to host {self.host}: ssh failed'):
-            _ = self.csp.ssh_client
+            self.csp.run()
 
-        self.assert_ssh_connected()
+        self.ssh_client.exec_command.assert_not_called()
 
-    def test_ssh_client_socket_error(self):
-        """Test the ssh_client property when socket.error is raised by connect."""
-        self.ssh_client.connect.side_effect = socket.error
+    def test_run_connect_socket_error(self):
+        """Test run when socket.error is raised while connecting."""
+        self.mock_pooled_ssh.return_value.__enter__.side_effect = socket.error
         with self.assert_exits_with_err(f'Failed to connect to host {self.host}: '):
-            _ = self.csp.ssh_client
+            self.csp.run()
 
-        self.assert_ssh_connected()
+        self.ssh_client.exec_command.assert_not_called()
 
     def set_up_mock_exec_command(self, exit_status, stdout_bytes, stderr_bytes):
         """Set up mock return value for exec_command method of SSHClient.
@@ -199,6 +208,7 @@ class TestContainerStopProcess(unittest.TestCase):
         mock_stderr = mock.Mock()
         mock_stderr.read.return_value = stderr_bytes
         self.ssh_client.exec_command.return_value = mock.Mock(), mock_stdout, mock_stderr
+        self.csp.ssh_client = self.ssh_client
 
     def test_run_remote_command_success(self):
         """Test _run_remote_command method in the successful case."""
@@ -207,7 +217,7 @@ class TestContainerStopProcess(unittest.TestCase):
 
         exit_status, stdout, stderr = self.csp._run_remote_command(command)
 
-        self.ssh_client.exec_command.assert_called_once_with(command)
+        self.ssh_client.exec_command.assert_called_once_with(command, timeout=CONTAINER_STOP_COMMAND_TIMEOUT)
         self.assertEqual(0, exit_status)
         self.assertEqual('containerid1\ncontainerid2\n', stdout)
         self.assertEqual('', stderr)
@@ -215,12 +225,22 @@ class TestContainerStopProcess(unittest.TestCase):
     def test_run_remote_command_ssh_exception(self):
         """Test _run_remote_command method when exec_command raises SSHException"""
         self.ssh_client.exec_command.side_effect = SSHException('ssh failure')
+        self.csp.ssh_client = self.ssh_client
         command = 'crictl ps -q'
 
         with self.assert_exits_with_err(f'Failed to execute {command} on {self.host}: ssh failure'):
             self.csp._run_remote_command(command)
 
-        self.ssh_client.exec_command.assert_called_once_with(command)
+        self.ssh_client.exec_command.assert_called_once_with(command, timeout=CONTAINER_STOP_COMMAND_TIMEOUT)
+
+    def test_run_remote_command_read_timeout(self):
+        """Test _run_remote_command method when reading the output of the command times out"""
+        self.set_up_mock_exec_command(0, b'', b'')
+        self.ssh_client.exec_command.return_value[1].read.side_effect = socket.timeout('timed out')
+        command = 'crictl ps -q'
+
+        with self.assert_exits_with_err(f'Failed to execute {command} on {self.host}: timed out'):
+            self.csp._run_remote_command(command)
 
     def test_run_remote_command_non_zero_exit(self):
         """Test _run_remote_command method when command exits non-zero"""
@@ -232,7 +252,7 @@ class TestContainerStopProcess(unittest.TestCase):
         with self.assert_exits_with_err(err_msg):
             self.csp._run_remote_command(command)
 
-        self.ssh_client.exec_command.assert_called_once_with(command)
+        self.ssh_client.exec_command.assert_called_once_with(command, timeout=CONTAINER_STOP_COMMAND_TIMEOUT)
 
     def test_run_remote_command_non_zero_exit_ignored(self):
         """Test _run_remote_command method when command exits non-zero"""
@@ -241,7 +261,7 @@ class TestContainerStopProcess(unittest.TestCase):
 
         exit_status, stdout, stderr = self.csp._run_remote_command(command, err_on_non_zero=False)
 
-        self.ssh_client.exec_command.assert_called_once_with(command)
+        self.ssh_client.exec_command.assert_called_once_with(command, timeout=CONTAINER_STOP_COMMAND_TIMEOUT)
         self.assertEqual(1, exit_status)
         self.assertEqual('okay', stdout)
         self.assertEqual('just a warning', stderr)
@@ -424,6 +444,48 @@ class TestContainerStopProcess(unittest.TestCase):
         self.assertEqual([mock.call()] * 4, mock_get_containers.mock_calls)
 
 
+class TestContainerStopperPooledSSH(unittest.TestCase):
+    """Test that ContainerStopper and RemoteServiceWaiter share pooled SSH clients."""
+
+    def setUp(self):
+        """Mock only the creation of SSH clients, so that the real pool is used."""
+        self.host = 'ncn-w001'
+        self.ssh_client = mock.Mock()
+        self.ssh_client.exec_command.side_effect = self._fake_exec_command
+        self.mock_get_ssh_client = mock.patch('sat.cli.bootsys.util.get_ssh_client',
+                                              return_value=self.ssh_client).start()
+
+    def tearDown(self):
+        close_pooled_ssh_clients()
+        mock.patch.stopall()
+
+    @staticmethod
+    def _fake_exec_command(command, timeout=None):
+        """Report containerd as inactive for both steps."""
+        exit_status = 3 if command == 'systemctl is-active containerd' else 0
+        stdout = mock.Mock()
+        stdout.read.return_value = b'inactive\ninactive\n'
+        stdout.channel.recv_exit_status.return_value = exit_status
+        stderr = mock.Mock()
+        stderr.read.return_value = b''
+        return mock.Mock(), stdout, stderr
+
+    def test_containerd_stop_reuses_client(self):
+        """Test that stopping containerd reuses the client used to stop containers."""
+        result_queue = Queue()
+        with self.assertRaises(SystemExit) as raises_cm:
+            ContainerStopper(self.host, result_queue=result_queue).run()
+        self.assertEqual(0, raises_cm.exception.code)
+        self.assertEqual((self.host, True), result_queue.get(timeout=0.01))
+
+        waiter = RemoteServiceWaiter(self.host, 'containerd', target_state='inactive', timeout=60)
+        self.assertTrue(waiter.wait_for_completion())
+
+        self.mock_get_ssh_client.assert_called_once()
+        self.ssh_client.connect.assert_called_once()
+        self.ssh_client.close.assert_not_called()
+
+
 class TestRemoteServiceWaiter(unittest.TestCase):
     """Tests for the RemoteServiceWaiter class."""
     def setUp(self):
@@ -431,44 +493,90 @@ class TestRemoteServiceWaiter(unittest.TestCase):
         self.host = 'ncn-w001'
         self.service_name = 'exampled'
         self.timeout = 60
-        self.service_status = b'active\n'
-        self.enabled_status = b'enabled\n'
+        self.service_status = 'active'
+        self.enabled_status = 'enabled'
         # set self.systemctl_works to False to mimic cases when running the command does not
         # change the service's status
         self.systemctl_works = True
-        self.get_ssh_client = mock.patch('sat.cli.bootsys.platform.get_ssh_client').start()
-        self.ssh_client = self.get_ssh_client.return_value
+        # set self.post_action_status to mimic the service not yet having reached its target
+        # state when the combined service action command finishes
+        self.post_action_status = None
+        self.mock_pooled_ssh = mock.patch('sat.cli.bootsys.platform.pooled_ssh').start()
+        self.ssh_client = self.mock_pooled_ssh.return_value.__enter__.return_value
         self.ssh_client.exec_command.side_effect = self._fake_ssh_command
         self.ssh_return_values = mock.Mock(), mock.Mock(), mock.Mock()
         self.ssh_return_values[1].channel.recv_exit_status.return_value = 0
+        self.ssh_return_values[2].read.return_value = b''
+
+        self.waiter = self.get_waiter('inactive')
+
+    def tearDown(self):
+        mock.patch.stopall()
+
+    def get_waiter(self, target_state, target_enabled=None):
+        """Create a RemoteServiceWaiter for the service and host.
 
-        self.waiter = RemoteServiceWaiter(self.host, self.service_name, 'inactive', self.timeout)
+        Args:
+            target_state (str): the target state for the waiter
+            target_enabled (str or None): the target enabled state for the waiter
+
+        Returns:
+            RemoteServiceWaiter: the waiter
+        """
+        self.waiter = RemoteServiceWaiter(self.host, self.service_name, target_state,
+                                          self.timeout, target_enabled=target_enabled)
+        return self.waiter
 
-    def _fake_ssh_command(self, cmd):
+    def _fake_ssh_command(self, cmd, timeout=None):
         """Fake the behavior of SSHClient.exec_command."""
-        if cmd.startswith('systemctl is-active'):
-            self.ssh_return_values[1].read.return_value = self.service_status
-        elif cmd.startswith('systemctl is-enabled'):
-            self.ssh_return_values[1].read.return_value = self.enabled_status
-        if self.systemctl_works:
-            if cmd.startswith('systemctl stop'):
-                self.service_status = b'inactive\n'
-            elif cmd.startswith('systemctl start'):
-                self.service_status = b'active\n'
-            elif cmd.startswith('systemctl enable'):
-                self.enabled_status = b'enabled\n'
+        if cmd == f'systemctl is-active {self.service_name}':
+            self.ssh_return_values[1].read.return_value = f'{self.service_status}\n'.encode()
+        elif cmd == self.waiter._service_action_command:
+            # The combined command prints the states of the service before changing them,
+            # followed by the active state of the service after changing it
+            states = [self.service_status]
+            if self.waiter.target_enabled:
+                states.append(self.enabled_status)
+            if self.systemctl_works:
+                self.service_status = self.waiter.target_state
+                if self.waiter.target_enabled:
+                    self.enabled_status = self.waiter.target_enabled
+            post_action_status = self.post_action_status or self.service_status
+            self.ssh_return_values[1].read.return_value = (
+                f'{" ".join(states)}\n{post_action_status}\n'.encode()
+            )
+        else:
+            self.fail(f'exec_command called with unexpected command "{cmd}"')
 
         return self.ssh_return_values
 
     def assert_ssh_connected(self):
-        """Assert the SSH client connected to the host."""
-        self.ssh_client.connect.assert_called_once_with(self.host)
+        """Assert an SSH client for the host was taken from the pool and released."""
+        self.mock_pooled_ssh.assert_called_once_with(self.host, host_keys=None)
+        self.mock_pooled_ssh.return_value.__exit__.assert_called_once()
+
+    def assert_commands_executed(self, poll=False):
+        """Assert the combined service action command was executed, optionally followed by a poll.
+
+        Args:
+            poll (bool): whether the service state should have been polled
+                after the service action command.
+        """
+        expected_calls = [mock.call(self.waiter._service_action_command,
+                                    timeout=SERVICE_ACTION_COMMAND_TIMEOUT)]
+        if poll:
+            expected_calls.append(mock.call(f'systemctl is-active {self.service_name}',
+                                            timeout=self.waiter.timeout))
+        self.assertEqual(expected_calls, self.ssh_client.exec_command.mock_calls)
 
     def test_init(self):
         """Test creating a RemoteServiceWaiter."""
         self.assertEqual(self.waiter.timeout, self.timeout)
         self.assertEqual(self.waiter.host, self.host)
         self.assertEqual(self.waiter.service_name, self.service_name)
+        self.assertEqual(0.2, self.waiter.poll_interval)
+        self.assertEqual(1.5, self.waiter.poll_backoff)
+        self.assertEqual(5.0, self.waiter.max_poll_interval)
         self.assertEqual(f'service {self.service_name} inactive on {self.host}',
                          self.waiter.condition_name())
 
@@ -501,87 +609,191 @@ class TestRemoteServiceWaiter(unittest.TestCase):
                 RemoteServiceWaiter(self.host, self.service_name, 'active', self.timeout,
                                     target_enabled=val)
 
+    def get_settle_command(self):
+        """Get the end of the combined command which waits for the service to settle and prints its state."""
+        return (f'for _ in $(seq {SERVICE_SETTLE_CHECKS}); do active=$(systemctl is-active {self.service_name}); '
+                f'case "$active" in activating|deactivating|reloading) sleep {SERVICE_SETTLE_INTERVAL};; '
+                f'*) break;; esac; done; echo "$active"')
+
+    def test_service_action_command_stop(self):
+        """Test the combined command to stop a service."""
+        self.assertEqual(
+            f'active=$(systemctl is-active {self.service_name}); echo "$active"; '
+            f'{{ [ "$active" = inactive ] || systemctl stop {self.service_name}; }}; '
+            f'status=$?; {self.get_settle_command()}; exit $status',
+            self.waiter._get_service_action_command()
+        )
+
+    def test_service_action_command_start_with_enable(self):
+        """Test the combined command to start and enable a service."""
+        waiter = self.get_waiter('active', target_enabled='enabled')
+        self.assertEqual(
+            f'active=$(systemctl is-active {self.service_name}); '
+            f'enabled=$(systemctl is-enabled {self.service_name}); '
+            f'echo "$active" "$enabled"; '
+            f'{{ [ "$active" = active ] || systemctl start {self.service_name}; }} && '
+            f'{{ [ "$enabled" = enabled ] || systemctl enable {self.service_name}; }}; '
+            f'status=$?; {self.get_settle_command()}; exit $status',
+            waiter._get_service_action_command()
+        )
+
+    def test_service_action_command_stop_with_disable(self):
+        """Test the combined command to stop and disable a service."""
+        waiter = self.get_waiter('inactive', target_enabled='disabled')
+        self.assertEqual(
+            f'active=$(systemctl is-active {self.service_name}); '
+            f'enabled=$(systemctl is-enabled {self.service_name}); '
+            f'echo "$active" "$enabled"; '
+            f'{{ [ "$active" = inactive ] || systemctl stop {self.service_name}; }} && '
+            f'{{ [ "$enabled" = disabled ] || systemctl disable {self.service_name}; }}; '
+            f'status=$?; {self.get_settle_command()}; exit $status',
+            waiter._get_service_action_command()
+        )
+
     def test_wait_for_stop(self):
         """When the service stops, the waiter should complete."""
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl stop {self.service_name}'),
-                                                       mock.call(f'systemctl is-active {self.service_name}')])
+        self.assert_commands_executed()
 
     def test_wait_for_start(self):
         """When the service starts, the waiter should complete."""
-        self.waiter.target_state = 'active'
-        self.service_status = b'inactive\n'
+        self.get_waiter('active')
+        self.service_status = 'inactive'
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl start {self.service_name}'),
-                                                       mock.call(f'systemctl is-active {self.service_name}')])
+        self.assert_commands_executed()
+
+    def test_wait_for_start_polls(self):
+        """When the service is still starting after the service action, the waiter should poll."""
+        self.get_waiter('active')
+        self.service_status = 'inactive'
+        self.post_action_status = 'activating'
+        with mock.patch('sat.waiting.time.sleep') as mock_sleep:
+            self.assertTrue(self.waiter.wait_for_completion())
+        mock_sleep.assert_called_once_with(self.waiter.poll_interval)
+        self.assert_ssh_connected()
+        self.assert_commands_executed(poll=True)
+
+    def test_slow_service_action(self):
+        """A service action that takes longer than the waiter timeout should not fail the waiter."""
+        self.get_waiter('active')
+        self.service_status = 'inactive'
+        action_duration = self.timeout + 30
+
+        def slow_ssh_command(cmd, timeout=None):
+            # Reading the output of the service action command times out
+            # if the read timeout is shorter than the action takes
+            if cmd == self.waiter._service_action_command and timeout < action_duration:
+                self.ssh_return_values[1].read.side_effect = socket.timeout('timed out')
+            return self._fake_ssh_command(cmd, timeout)
+
+        self.ssh_client.exec_command.side_effect = slow_ssh_command
+        self.assertTrue(self.waiter.wait_for_completion())
+        self.assert_commands_executed()
+
+    def test_commands_built_once(self):
+        """The service action command should be built when the waiter is created, not on each wait."""
+        with mock.patch.object(RemoteServiceWaiter, '_get_service_action_command',
+                               wraps=self.waiter._get_service_action_command) as mock_get_command:
+            self.assertTrue(self.waiter.wait_for_completion())
+        mock_get_command.assert_not_called()
+        self.assert_commands_executed()
+
+    def assert_cancelled(self, logs_cm):
+        """Assert the waiter was cancelled and that this was not logged as an error.
+
+        Args:
+            logs_cm: the value yielded by `self.assertLogs`
+        """
+        self.assertTrue(self.waiter.cancelled)
+        self.assertFalse(self.waiter.completed)
+        self.assertEqual([], [record for record in logs_cm.records
+                              if record.levelno >= logging.WARNING])
+        self.assertEqual(
+            [f'Stopped waiting for condition "{self.waiter.condition_name()}": '
+             f'waiting was cancelled due to a failure on another host'],
+            [record.message for record in logs_cm.records if record.levelno == logging.INFO]
+        )
+
+    def test_wait_cancelled(self):
+        """When the cancel event is set before waiting, the service should not be changed."""
+        cancel_event = Event()
+        cancel_event.set()
+        self.waiter = RemoteServiceWaiter(self.host, self.service_name, 'active', self.timeout,
+                                          cancel_event=cancel_event)
+        self.service_status = 'inactive'
+        with self.assertLogs(level=logging.INFO) as logs_cm:
+            self.assertFalse(self.waiter.wait_for_completion())
+        self.assert_cancelled(logs_cm)
+        self.ssh_client.exec_command.assert_not_called()
+
+    def test_wait_cancelled_while_polling(self):
+        """When the cancel event is set after the service action, the waiter should stop polling."""
+        cancel_event = Event()
+        self.waiter = RemoteServiceWaiter(self.host, self.service_name, 'active', self.timeout,
+                                          cancel_event=cancel_event)
+        self.service_status = 'inactive'
+        self.post_action_status = 'activating'
+
+        def cancel_and_check():
+            """Cancel waiting as if the service action failed on another host."""
+            cancel_event.set()
+            return False
+
+        with mock.patch.object(self.waiter, 'has_completed', side_effect=cancel_and_check):
+            with self.assertLogs(level=logging.INFO) as logs_cm:
+                self.assertFalse(self.waiter.wait_for_completion())
+        self.assert_cancelled(logs_cm)
+        self.assert_commands_executed()
 
     def test_wait_for_enable_only(self):
         """When target_enabled='enabled', an active but disabled service should be enabled."""
-        self.waiter.target_enabled = 'enabled'
-        self.waiter.target_state = 'active'
-        self.enabled_status = b'disabled\n'
+        self.get_waiter('active', target_enabled='enabled')
+        self.enabled_status = 'disabled'
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl is-enabled {self.service_name}'),
-                                                       mock.call(f'systemctl enable {self.service_name}')])
+        self.assert_commands_executed()
+        self.assertEqual('enabled', self.enabled_status)
 
     def test_wait_for_start_with_enable(self):
         """When target_enabled='enabled', a disabled service should be enabled."""
-        self.waiter.target_enabled = 'enabled'
-        self.waiter.target_state = 'active'
-        self.service_status = b'inactive\n'
-        self.enabled_status = b'disabled\n'
+        self.get_waiter('active', target_enabled='enabled')
+        self.service_status = 'inactive'
+        self.enabled_status = 'disabled'
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl start {self.service_name}'),
-                                                       mock.call(f'systemctl is-enabled {self.service_name}'),
-                                                       mock.call(f'systemctl enable {self.service_name}'),
-                                                       mock.call(f'systemctl is-active {self.service_name}')])
+        self.assert_commands_executed()
+        self.assertEqual('enabled', self.enabled_status)
 
     def test_wait_for_start_with_enable_already_enabled(self):
         """When target_enabled='enabled', an already-enabled service should be left alone."""
-        self.waiter.target_enabled = 'enabled'
-        self.waiter.target_state = 'active'
-        self.service_status = b'inactive\n'
+        self.get_waiter('active', target_enabled='enabled')
+        self.service_status = 'inactive'
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl start {self.service_name}'),
-                                                       mock.call(f'systemctl is-enabled {self.service_name}'),
-                                                       mock.call(f'systemctl is-active {self.service_name}')])
+        self.assert_commands_executed()
+        self.assertEqual('enabled', self.enabled_status)
 
     def test_wait_for_stop_with_disable(self):
         """When target_enabled='disabled', an enabled service should be disabled."""
-        self.waiter.target_enabled = 'disable'
-        self.waiter.target_state = 'inactive'
-        self.service_status = b'active\n'
-        self.enabled_status = b'enabled\n'
+        self.get_waiter('inactive', target_enabled='disabled')
+        self.service_status = 'active'
+        self.enabled_status = 'enabled'
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl stop {self.service_name}'),
-                                                       mock.call(f'systemctl is-enabled {self.service_name}'),
-                                                       mock.call(f'systemctl disable {self.service_name}'),
-                                                       mock.call(f'systemctl is-active {self.service_name}')])
+        self.assert_commands_executed()
+        self.assertEqual('disabled', self.enabled_status)
 
     def test_wait_for_stop_with_disable_already_disabled(self):
-        """When target_enabled='enabled', an already-enabled service should be left alone."""
-        self.waiter.target_enabled = 'disabled'
-        self.waiter.target_state = 'inactive'
-        self.service_status = b'active\n'
-        self.enabled_status = b'disabled\n'
+        """When target_enabled='disabled', an already-disabled service should be left alone."""
+        self.get_waiter('inactive', target_enabled='disabled')
+        self.service_status = 'active'
+        self.enabled_status = 'disabled'
         self.assertTrue(self.waiter.wait_for_completion())
         self.assert_ssh_connected()
-        self.ssh_client.exec_command.assert_has_calls([mock.call(f'systemctl is-active {self.service_name}'),
-                                                       mock.call(f'systemctl stop {self.service_name}'),
-                                                       mock.call(f'systemctl is-enabled {self.service_name}'),
-                                                       mock.call(f'systemctl is-active {self.service_name}')])
+        self.assert_commands_executed()
+        self.assertEqual('disabled', self.enabled_status)
 
     def test_timeout(self):
         """When the service never stops, the waiter should time out."""
@@ -605,16 +817,28 @@ class TestRemoteServiceWaiter(unittest.TestCase):
         with mock.patch('sat.waiting.time.monotonic', side_effect=range(5)):
             with self.assertLogs(level=logging.ERROR):
                 self.assertFalse(self.waiter.wait_for_completion())
+        self.assert_commands_executed()
+
+    def test_read_timeout(self):
+        """When reading the output of a command times out, an error should be logged."""
+        self.ssh_return_values[1].read.side_effect = socket.timeout('timed out')
+        with self.assertLogs(level=logging.ERROR) as logs_cm:
+            self.assertFalse(self.waiter.wait_for_completion())
+        self.assertEqual('timed out', logs_cm.records[0].message)
+        self.assert_commands_executed()
 
     def test_service_already_stopped(self):
         """When the service is already stopped, just check that it's stopped and return."""
-        self.service_status = b'inactive\n'
-        self.waiter.wait_for_completion()
-        self.ssh_client.exec_command.assert_called_once_with(f'systemctl is-active {self.service_name}')
+        self.service_status = 'inactive'
+        with self.assertLogs(level=logging.DEBUG) as logs_cm:
+            self.assertTrue(self.waiter.wait_for_completion())
+        self.assert_commands_executed()
+        self.assertEqual(f'Found service {self.service_name} inactive on {self.host} already; '
+                         f'no action needed.', logs_cm.records[-1].message)
 
     def test_unknown_state_stop(self):
         """When stopping a service in 'unknown' state, the waiter should time out."""
-        self.service_status = b'unknown\n'
+        self.service_status = 'unknown'
         self.systemctl_works = False
         # fake time so that there is no time spent between iterations, but calls to time.monotonic()
         # make it appear as though time has passed.
@@ -626,9 +850,9 @@ class TestRemoteServiceWaiter(unittest.TestCase):
 
     def test_unknown_state_start(self):
         """When starting a service in 'unknown' state, the waiter should time out."""
-        self.service_status = b'unknown\n'
+        self.service_status = 'unknown'
         self.systemctl_works = False
-        self.waiter = RemoteServiceWaiter(self.host, self.service_name, 'active', self.timeout)
+        self.get_waiter('active')
         # fake time so that there is no time spent between iterations, but calls to time.monotonic()
         # make it appear as though time has passed.
         self.waiter.timeout = 2
@@ -658,6 +882,8 @@ class TestDoPlatformAction(unittest.TestCase):
 
         self.mock_get_and_verify_ncn_groups = mock.patch(
             'sat.cli.bootsys.platform.get_and_verify_ncn_groups').start()
+        self.mock_close_pooled_ssh_clients = mock.patch(
+            'sat.cli.bootsys.platform.close_pooled_ssh_clients').start()
 
     def tearDown(self):
         mock.patch.stopall()
@@ -691,6 +917,7 @@ class TestDoPlatformAction(unittest.TestCase):
         self.mock_get_and_verify_ncn_groups.assert_called_once_with(self.mock_args.excluded_ncns)
         self.assertEqual(cm.records[0].message, 'Executing step: first step')
         self.assertEqual(cm.records[1].message, 'Executing step: second step')
+        self.mock_close_pooled_ssh_clients.assert_called_once_with()
 
     def test_do_platform_action_fatal_step(self):
         """Test do_platform_action when a step fails fatally."""
@@ -705,6 +932,7 @@ class TestDoPlatformAction(unittest.TestCase):
         self.assertEqual(cm.records[1].message, f'Fatal error in step "first step" of '
                                                 f'platform services {self.known_action}: fail')
         self.assertEqual(cm.records[1].levelno, logging.ERROR)
+        self.mock_close_pooled_ssh_clients.assert_called_once_with()
 
     @mock.patch('sat.cli.bootsys.platform.pester_choices', return_value='no')
     def test_do_platform_action_non_fatal_step_abort(self, mock_pester_choices):
@@ -776,13 +1004,10 @@ class TestDoStopContainers(unittest.TestCase):
         self.k8s_ncns = ['ncn-w001', 'ncn-w002', 'ncn-w003', 'ncn-m001', 'ncn-m002']
         self.failed_ncns = failed_ncns = []
 
-        # Use Thread to avoid issues pickling the mocked class when using Process
-        # Their interfaces are similar enough that it works.
-        class MockContainerStopProcess(threading.Thread):
-            """Mock the ContainerStopProcess for these tests."""
+        class MockContainerStopper:
+            """Mock the ContainerStopper for these tests."""
 
             def __init__(self, host, host_keys, result_queue):
-                super().__init__()
                 self.host = host
                 self.success = False
                 self.result_queue = result_queue
@@ -790,24 +1015,36 @@ class TestDoStopContainers(unittest.TestCase):
             def run(self):
                 self.success = self.host not in failed_ncns
                 self.result_queue.put((self.host, self.success))
+                raise SystemExit(int(not self.success))
 
         self.ncn_groups = {'kubernetes': self.k8s_ncns}
         self.result_queue = Queue()
-        mock.patch('sat.cli.bootsys.platform.ContainerStopProcess', MockContainerStopProcess).start()
+        mock.patch('sat.cli.bootsys.platform.ContainerStopper', MockContainerStopper).start()
+        self.mock_get_config_value = mock.patch('sat.cli.bootsys.platform.get_config_value',
+                                                return_value=16).start()
         self.mock_host_keys = mock.patch('sat.cli.bootsys.platform.FilteredHostKeys').start()
 
     def tearDown(self):
         mock.patch.stopall()
 
-    def test_do_stop_containers_threads_executed(self):
-        """Test that do_stop_containers calls thread methods appropriately."""
+    def test_do_stop_containers_parallel_ssh_limit(self):
+        """Test that the number of concurrent container stops is limited by config."""
+        self.mock_get_config_value.return_value = 2
+        with mock.patch('sat.cli.bootsys.platform.ThreadPoolExecutor',
+                        wraps=ThreadPoolExecutor) as mock_executor_cls:
+            do_stop_containers(self.ncn_groups)
+        self.mock_get_config_value.assert_called_once_with('bootsys.max_parallel_ssh')
+        mock_executor_cls.assert_called_once_with(max_workers=2)
+
+    def test_do_stop_containers_run_executed(self):
+        """Test that do_stop_containers runs each ContainerStopper."""
         mock_procs = [mock.Mock(host=ncn, success=True, result_queue=self.result_queue)
                       for ncn in self.k8s_ncns]
 
         with mock.patch('sat.cli.bootsys.platform.Queue') as mock_queue_cls:
-            # Replace the queue so we can assert the calls to create each ContainerStopProcess
+            # Replace the queue so we can assert the calls to create each ContainerStopper
             mock_queue_cls.return_value = self.result_queue
-            with mock.patch('sat.cli.bootsys.platform.ContainerStopProcess') as mock_csp:
+            with mock.patch('sat.cli.bootsys.platform.ContainerStopper') as mock_csp:
                 mock_csp.side_effect = mock_procs
                 do_stop_containers(self.ncn_groups)
 
@@ -817,7 +1054,7 @@ class TestDoStopContainers(unittest.TestCase):
             mock_csp.mock_calls
         )
         for mock_proc in mock_procs:
-            self.assertEqual([mock.call.start(), mock.call.join()], mock_proc.mock_calls)
+            self.assertEqual([mock.call.run()], mock_proc.mock_calls)
 
     def test_do_stop_containers_successful(self):
         """Test a do_stop_containers with all successful."""
@@ -825,7 +1062,8 @@ class TestDoStopContainers(unittest.TestCase):
 
     def test_do_stop_containers_errors(self):
         """Test a call of do_stop_containers when there a couple NCNs fail"""
-        self.failed_ncns.extend(['ncn-w002', 'ncn-m001'])
+        # Failures are reported in the order of the given NCNs
+        self.failed_ncns.extend(['ncn-m001', 'ncn-w002'])
 
         err_regex = r'Failed to stop containers on the following NCN\(s\): ncn-w002, ncn-m001'
 
@@ -911,6 +1149,20 @@ class TestDoServiceActionOnHosts(unittest.TestCase):
                                       side_effect=self.mock_waiters).start()
 
         self.mock_host_keys = mock.patch('sat.cli.bootsys.platform.FilteredHostKeys').start()
+        self.max_parallel_ssh = 2
+        self.mock_get_config_value = mock.patch('sat.cli.bootsys.platform.get_config_value',
+                                                return_value=self.max_parallel_ssh).start()
+        self.mock_executor_cls = mock.patch('sat.cli.bootsys.platform.ThreadPoolExecutor',
+                                            wraps=ThreadPoolExecutor).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+
+    def test_parallel_ssh_limit(self):
+        """Test that the number of concurrent service actions is limited by config."""
+        do_service_action_on_hosts(self.hosts, self.service, self.target_state)
+        self.mock_get_config_value.assert_called_once_with('bootsys.max_parallel_ssh')
+        self.mock_executor_cls.assert_called_once_with(max_workers=self.max_parallel_ssh)
 
     def test_all_successful(self):
         """Test doing a service action when it is successful on all hosts."""
@@ -919,12 +1171,23 @@ class TestDoServiceActionOnHosts(unittest.TestCase):
         self.mock_waiter.assert_has_calls([
             mock.call(host, self.service, target_state=self.target_state,
                       timeout=SERVICE_ACTION_TIMEOUT, target_enabled=self.target_enabled,
-                      host_keys=self.mock_host_keys.return_value)
+                      host_keys=self.mock_host_keys.return_value, cancel_event=mock.ANY)
             for host in self.hosts
         ])
         for waiter in self.mock_waiters:
-            waiter.wait_for_completion_async.assert_called_once_with()
-            waiter.wait_for_completion_await.assert_called_once_with()
+            waiter.wait_for_completion.assert_called_once_with()
+
+    def block_until_cancelled(self):
+        """Make waiters other than the first block until waiting is cancelled.
+
+        Returns:
+            threading.Event: the event used to cancel waiting
+        """
+        cancel_event = Event()
+        mock.patch('sat.cli.bootsys.platform.Event', return_value=cancel_event).start()
+        for waiter in self.mock_waiters[1:]:
+            waiter.wait_for_completion.side_effect = lambda: cancel_event.wait(5)
+        return cancel_event
 
     def test_one_failure(self):
         """Test doing a service action when it fails on a single host."""
@@ -938,12 +1201,37 @@ class TestDoServiceActionOnHosts(unittest.TestCase):
         self.mock_waiter.assert_has_calls([
             mock.call(host, self.service, target_state=self.target_state,
                       timeout=SERVICE_ACTION_TIMEOUT, target_enabled=self.target_enabled,
-                      host_keys=self.mock_host_keys.return_value)
+                      host_keys=self.mock_host_keys.return_value, cancel_event=mock.ANY)
             for host in self.hosts
         ])
-        for waiter in self.mock_waiters:
-            waiter.wait_for_completion_async.assert_called_once_with()
-            waiter.wait_for_completion_await.assert_called_once_with()
+        self.mock_waiters[2].wait_for_completion.assert_called_once_with()
+
+    def test_one_failure_cancels_others(self):
+        """Test that a failure on one host cancels waiting on the other hosts."""
+        cancel_event = self.block_until_cancelled()
+        self.mock_waiters[0].completed = False
+        err_regex = f'Failed to ensure {self.service} is {self.target_state} on all hosts.'
+        with self.assertRaisesRegex(FatalPlatformError, err_regex):
+            do_service_action_on_hosts(self.hosts, self.service, self.target_state)
+        self.assertTrue(cancel_event.is_set())
+        # The limit on parallel SSH connections means that at most two more
+        # waiters can start before the others are cancelled.
+        self.mock_waiters[0].wait_for_completion.assert_called_once_with()
+        for waiter in self.mock_waiters[3:]:
+            waiter.wait_for_completion.assert_not_called()
+
+    def test_unexpected_error(self):
+        """Test doing a service action when an unexpected error occurs on a single host."""
+        self.mock_waiters[2].completed = False
+        self.mock_waiters[2].wait_for_completion.side_effect = ValueError('unexpected')
+        self.mock_waiters[2].condition_name.return_value = 'the condition'
+        err_regex = f'Failed to ensure {self.service} is {self.target_state} on all hosts.'
+        with self.assertLogs(level=logging.ERROR) as logs_cm:
+            with self.assertRaisesRegex(FatalPlatformError, err_regex):
+                do_service_action_on_hosts(self.hosts, self.service, self.target_state)
+        self.assertEqual(['Unexpected error waiting for the condition: unexpected'],
+                         [record.message for record in logs_cm.records])
+        self.mock_waiters[2].wait_for_completion.assert_called_once_with()
 
 
 class TestDoEtcdSnapshotStartStop(unittest.TestCase):
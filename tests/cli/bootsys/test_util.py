@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020-2021, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020-2021, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,15 +25,21 @@
 Tests for common bootsys code.
 """
 import logging
+import socket
 from textwrap import dedent
 import unittest
 from unittest.mock import call, mock_open, patch, Mock
 
 from sat.cli.bootsys.util import (
+    SSH_CONNECT_KWARGS,
+    SSH_KEEPALIVE_INTERVAL,
+    close_pooled_ssh_clients,
     get_mgmt_ncn_hostnames,
+    get_mgmt_ncn_hostnames_by_subrole,
     get_and_verify_ncn_groups,
     get_mgmt_ncn_groups,
     get_ssh_client,
+    pooled_ssh,
     prompt_for_ncn_verification,
     FatalBootsysError
 )
@@ -90,6 +96,28 @@ class TestGetNcns(unittest.TestCase):
         actual = get_mgmt_ncn_hostnames(['managers', 'workers', 'storage'])
         self.assertEqual(expected, actual)
 
+    def test_get_ncns_by_subrole(self):
+        """Test getting hostnames of managers, workers, and storage nodes grouped by subrole."""
+        # Note that ncn-m001 is commented out
+        expected = {
+            'managers': {'ncn-m002', 'ncn-m003'},
+            'workers': {'ncn-w001', 'ncn-w002', 'ncn-w003'},
+            'storage': {'ncn-s001', 'ncn-s002', 'ncn-s003'}
+        }
+        actual = get_mgmt_ncn_hostnames_by_subrole(['managers', 'workers', 'storage'])
+        self.assertEqual(expected, actual)
+
+    def test_get_ncns_by_subrole_one_subrole(self):
+        """Test getting hostnames grouped by subrole only includes the given subroles."""
+        expected = {'workers': {'ncn-w001', 'ncn-w002', 'ncn-w003'}}
+        actual = get_mgmt_ncn_hostnames_by_subrole(['workers'])
+        self.assertEqual(expected, actual)
+
+    def test_get_ncns_by_subrole_invalid_subrole(self):
+        """Test getting hostnames grouped by subrole with an invalid subrole included."""
+        with self.assertRaisesRegex(ValueError, r'Invalid subroles given: impostors'):
+            get_mgmt_ncn_hostnames_by_subrole(['managers', 'impostors'])
+
     def test_get_invalid_subrole(self):
         """Test getting hostnames with an invalid subrole included."""
         subroles = ['managers', 'impostors', 'workers']
@@ -144,20 +172,17 @@ class TestGetNCNGroups(unittest.TestCase):
         self.mock_workers = ['ncn-w001', 'ncn-w002', 'ncn-w003']
         self.mock_storage = ['ncn-s001', 'ncn-s002', 'ncn-s003']
 
-        def mock_get_hostnames(subroles):
-            if subroles == ['managers']:
-                return set(self.mock_managers)
-            elif subroles == ['workers']:
-                return set(self.mock_workers)
-            elif subroles == ['managers', 'workers']:
-                return set(self.mock_managers + self.mock_workers)
-            elif subroles == ['storage']:
-                return set(self.mock_storage)
-            else:
-                return set()
-
-        self.mock_get_hostnames = patch(
-            'sat.cli.bootsys.util.get_mgmt_ncn_hostnames', mock_get_hostnames).start()
+        def mock_get_hostnames_by_subrole(subroles):
+            hostnames_by_subrole = {
+                'managers': self.mock_managers,
+                'workers': self.mock_workers,
+                'storage': self.mock_storage
+            }
+            return {subrole: set(hostnames_by_subrole[subrole]) for subrole in subroles}
+
+        self.mock_get_hostnames_by_subrole = patch(
+            'sat.cli.bootsys.util.get_mgmt_ncn_hostnames_by_subrole',
+            side_effect=mock_get_hostnames_by_subrole).start()
 
     def tearDown(self):
         patch.stopall()
@@ -179,6 +204,11 @@ class TestGetNCNGroups(unittest.TestCase):
         actual = get_mgmt_ncn_groups()
         self.assertEqual(expected, actual)
 
+    def test_hostnames_read_once(self):
+        """Test that get_mgmt_ncn_groups gets the hostnames of all subroles at once."""
+        get_mgmt_ncn_groups()
+        self.mock_get_hostnames_by_subrole.assert_called_once_with(['managers', 'workers', 'storage'])
+
     def test_one_exclusion_each(self):
         excluded = {self.mock_managers[0], self.mock_workers[1], self.mock_storage[2]}
         expected = (
@@ -373,3 +403,137 @@ class TestGetSSHClient(unittest.TestCase):
         self.mock_ssh_client.set_missing_host_key_policy.assert_called_once_with(
             self.mock_auto_add_policy
         )
+
+
+class TestPooledSSH(unittest.TestCase):
+    """Tests for the pooled_ssh context manager and close_pooled_ssh_clients."""
+
+    def setUp(self):
+        """Set up a mock get_ssh_client which creates a new mock client on each call."""
+        self.mock_get_ssh_client = patch('sat.cli.bootsys.util.get_ssh_client',
+                                         side_effect=lambda **kwargs: Mock()).start()
+        self.host = 'ncn-w001'
+
+    def tearDown(self):
+        close_pooled_ssh_clients()
+        patch.stopall()
+
+    def test_new_connection(self):
+        """Test that pooled_ssh connects a new client when the pool is empty."""
+        host_keys = Mock()
+        with pooled_ssh(self.host, host_keys=host_keys) as ssh_client:
+            ssh_client.connect.assert_called_once_with(self.host, **SSH_CONNECT_KWARGS)
+        self.mock_get_ssh_client.assert_called_once_with(host_keys=host_keys)
+        ssh_client.close.assert_not_called()
+
+    def test_new_connection_socket_options(self):
+        """Test that pooled_ssh disables Nagle's algorithm and enables keepalive on new connections."""
+        with pooled_ssh(self.host) as ssh_client:
+            pass
+        transport = ssh_client.get_transport.return_value
+        transport.sock.setsockopt.assert_called_once_with(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        transport.set_keepalive.assert_called_once_with(SSH_KEEPALIVE_INTERVAL)
+
+    def test_new_connection_sha1_kex_disabled(self):
+        """Test that pooled_ssh disables the SHA-1 key exchange algorithms on new connections."""
+        with pooled_ssh(self.host) as ssh_client:
+            pass
+        disabled_kex = ssh_client.connect.call_args.kwargs['disabled_algorithms']['kex']
+        self.assertEqual(
+            ['diffie-hellman-group-exchange-sha1', 'diffie-hellman-group14-sha1',
+             'diffie-hellman-group1-sha1'],
+            disabled_kex
+        )
+
+    def test_connection_reused(self):
+        """Test that a released client is reused for the same host."""
+        with pooled_ssh(self.host) as first_client:
+            pass
+        with pooled_ssh(self.host) as second_client:
+            pass
+        self.assertIs(first_client, second_client)
+        first_client.connect.assert_called_once_with(self.host, **SSH_CONNECT_KWARGS)
+        self.mock_get_ssh_client.assert_called_once()
+
+    def test_connection_not_shared(self):
+        """Test that a client in use is not handed out again, and hosts have separate clients."""
+        with pooled_ssh(self.host) as first_client, pooled_ssh(self.host) as second_client, \
+                pooled_ssh('ncn-w002') as other_host_client:
+            self.assertIsNot(first_client, second_client)
+            other_host_client.connect.assert_called_once_with('ncn-w002', **SSH_CONNECT_KWARGS)
+        self.assertEqual(3, self.mock_get_ssh_client.call_count)
+
+    def test_inactive_connection_closed(self):
+        """Test that a client whose transport is inactive is closed rather than reused."""
+        with pooled_ssh(self.host) as first_client:
+            first_client.get_transport.return_value.is_active.return_value = False
+        first_client.close.assert_called_once_with()
+        with pooled_ssh(self.host) as second_client:
+            pass
+        self.assertIsNot(first_client, second_client)
+
+    def test_connect_failure_closes_client(self):
+        """Test that a client which fails to connect is closed and not added to the pool."""
+        failed_client = Mock()
+        failed_client.connect.side_effect = socket.error
+        self.mock_get_ssh_client.side_effect = [failed_client, Mock()]
+        with self.assertRaises(socket.error):
+            with pooled_ssh(self.host):
+                self.fail('pooled_ssh yielded a client which failed to connect')
+        failed_client.close.assert_called_once_with()
+        with pooled_ssh(self.host) as second_client:
+            pass
+        self.assertIsNot(failed_client, second_client)
+
+    def test_socket_option_failure_closes_client(self):
+        """Test that a client is closed if configuring its connection fails."""
+        failed_client = Mock()
+        failed_client.get_transport.return_value.set_keepalive.side_effect = socket.error
+        self.mock_get_ssh_client.side_effect = [failed_client]
+        with self.assertRaises(socket.error):
+            with pooled_ssh(self.host):
+                self.fail('pooled_ssh yielded a client which failed to be configured')
+        failed_client.close.assert_called_once_with()
+
+    def test_exception_in_body_discards_client(self):
+        """Test that a client is closed rather than reused when the body raises an exception."""
+        with self.assertRaises(socket.timeout):
+            with pooled_ssh(self.host) as first_client:
+                raise socket.timeout
+        first_client.close.assert_called_once_with()
+        with pooled_ssh(self.host) as second_client:
+            pass
+        self.assertIsNot(first_client, second_client)
+
+    def test_system_exit_success_returns_client(self):
+        """Test that a client is returned to the pool when the body raises SystemExit(0)."""
+        for code in [0, None]:
+            with self.subTest(code=code):
+                with self.assertRaises(SystemExit):
+                    with pooled_ssh(self.host) as first_client:
+                        raise SystemExit(code)
+                first_client.close.assert_not_called()
+                with pooled_ssh(self.host) as second_client:
+                    pass
+                self.assertIs(first_client, second_client)
+                close_pooled_ssh_clients()
+
+    def test_system_exit_failure_discards_client(self):
+        """Test that a client is closed rather than reused when the body raises SystemExit(1)."""
+        with self.assertRaises(SystemExit):
+            with pooled_ssh(self.host) as first_client:
+                raise SystemExit(1)
+        first_client.close.assert_called_once_with()
+        with pooled_ssh(self.host) as second_client:
+            pass
+        self.assertIsNot(first_client, second_client)
+
+    def test_close_pooled_ssh_clients(self):
+        """Test that close_pooled_ssh_clients closes idle clients and empties the pool."""
+        with pooled_ssh(self.host) as first_client:
+            pass
+        close_pooled_ssh_clients()
+        first_client.close.assert_called_once_with()
+        with pooled_ssh(self.host) as second_client:
+            pass
+        self.assertIsNot(first_client, second_client)
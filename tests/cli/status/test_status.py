@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2022 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2022, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -33,20 +33,26 @@ from sat.constants import MISSING_VALUE
 from sat.xname import XName
 
 
-# a fake table row, representing a fake node
+# the default values of a fake table row, representing a fake node
 # all default values are compliant with Shasta API response schemas
+ROW_TEMPLATE = dict(ID='x4242c0s99b0n0', Type='Node', NID=1, State='Ready', Flag='OK',
+                    Enabled=True, Arch='Others', Role='Application', SubRole='UAN',
+                    NetType='OEM')
+
+
+# a fake table row, representing a fake node
 def row(**kwargs):
-    status = dict(ID='x4242c0s99b0n0', Type='Node', NID=1, State='Ready', Flag='OK',
-                  Enabled=True, Arch='Others', Role='Application', SubRole='UAN',
-                  NetType='OEM')
-    status.update(kwargs)
+    return {**ROW_TEMPLATE, **kwargs}
 
-    return status
+
+SAMPLE_NODES = (row(ID='z0'), row(ID='aa0', NID=42),
+                row(ID='q0', NID=9), row(ID='ab0', NID=20))
 
 
 def sample_nodes():
-    return [row(ID='z0'), row(ID='aa0', NID=42),
-            row(ID='q0', NID=9), row(ID='ab0', NID=20)]
+    # all values are immutable, so shallow copies are enough for tests to
+    # modify the rows independently
+    return [dict(node) for node in SAMPLE_NODES]
 
 
 @unittest.skip('See CRAYSAT-1356.')
@@ -67,9 +73,10 @@ class TestStatusBase(unittest.TestCase):
         make_raw_table() should return a table with a single row and the same
         number of columns as there are column headers
         """
+        expected_len = len(NODE_API_KEYS_TO_HEADERS)
         raw_table = make_raw_table([row()], NODE_API_KEYS_TO_HEADERS)
         self.assertEqual(len(raw_table), 1)
-        self.assertEqual(len(raw_table[0]), len(NODE_API_KEYS_TO_HEADERS))
+        self.assertEqual(len(raw_table[0]), expected_len)
 
     def test_many_default(self):
         """make_raw_table() with many nodes, default sorting
@@ -78,11 +85,13 @@ class TestStatusBase(unittest.TestCase):
         as nodes, each row should have the same number of columns as the
         column headers.
         """
+        # sample_nodes() builds new dicts, so they do not need to be copied
         nodes = sample_nodes()
-        raw_table = make_raw_table(deepcopy(nodes), NODE_API_KEYS_TO_HEADERS)
+        raw_table = make_raw_table(nodes, NODE_API_KEYS_TO_HEADERS)
         self.assertEqual(len(raw_table), len(nodes))
 
-        self.assertTrue(all(len(row) == len(NODE_API_KEYS_TO_HEADERS) for row in raw_table))
+        expected_len = len(NODE_API_KEYS_TO_HEADERS)
+        self.assertTrue(all(len(row) == expected_len for row in raw_table))
 
     def test_missing_xname(self):
         """Test that make_raw_table handles missing 'ID' key."""
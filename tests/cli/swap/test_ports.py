@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020-2021, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020-2021, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,182 +25,273 @@
 Unit tests for sat.cli.swap.ports
 """
 
-import logging
-import os
+import functools
+import operator
 import unittest
 from unittest import mock
-from unittest.mock import call
 
+from sat.apiclient import FabricControllerClient
+from sat.cli.swap.cable_endpoints import CableEndpoints
 from sat.cli.swap.ports import PortManager
-from tests.common import ExtendedTestCase
 
 
 # Constants used in the tests
 EDGE_POLICY_LINK = '/fabric/port-policies/edge-policy'
 FABRIC_POLICY_LINK = '/fabric/port-policies/fabric-policy'
 QOS_POLICY_LINK = '/fabric/port-policies/qos-ll_be_bd_et-fabric-policy'
+OFFLINE_EDGE_POLICY_LINK = '/fabric/port-policies/sat-offline-edge-policy'
+OFFLINE_FABRIC_POLICY_LINK = '/fabric/port-policies/sat-offline-fabric-policy'
+
+# The port data get_jack_port_data_list() returns for the cable between
+# x9000c1r3j16 and x9000c3r5j16
+SUCCESS_EXPECTED = [
+    {'xname': 'x9000c1r3j16p0',
+     'port_link': '/fabric/ports/x9000c1r3j16p0',
+     'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+    {'xname': 'x9000c1r3j16p1',
+     'port_link': '/fabric/ports/x9000c1r3j16p1',
+     'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+    {'xname': 'x9000c3r5j16p0',
+     'port_link': '/fabric/ports/x9000c3r5j16p0',
+     'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+    {'xname': 'x9000c3r5j16p1',
+     'port_link': '/fabric/ports/x9000c3r5j16p1',
+     'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]}
+]
+
+# The port data get_jack_port_data_list() returns for the cables on x9000c1r3j16
+# and x9000c1r3j18 in test_jacks_two_cables_with_force
+TWO_CABLES_EXPECTED = [
+    {'xname': 'x9000c1r3j16p0',
+     'port_link': '/fabric/ports/x9000c1r3j16p0',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c1r3j16p1',
+     'port_link': '/fabric/ports/x9000c1r3j16p1',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c1r3j18p0',
+     'port_link': '/fabric/ports/x9000c1r3j18p0',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c1r3j18p1',
+     'port_link': '/fabric/ports/x9000c1r3j18p1',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c3r3j16p0',
+     'port_link': '/fabric/ports/x9000c3r3j16p0',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c3r3j16p1',
+     'port_link': '/fabric/ports/x9000c3r3j16p1',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c3r5j16p0',
+     'port_link': '/fabric/ports/x9000c3r5j16p0',
+     'policy_links': [FABRIC_POLICY_LINK]},
+    {'xname': 'x9000c3r5j16p1',
+     'port_link': '/fabric/ports/x9000c3r5j16p1',
+     'policy_links': [FABRIC_POLICY_LINK]}
+]
+
+
+def start_patch(test_case, patcher):
+    """Start a patcher and stop it when the given test case is cleaned up.
+
+    Args:
+        test_case (unittest.TestCase): the test case using the patch
+        patcher: the patcher returned by mock.patch or mock.patch.object
+
+    Returns:
+        The mock object created by the patcher.
+    """
+    mock_obj = patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return mock_obj
+
+
+@functools.lru_cache(maxsize=1)
+def make_port_manager():
+    """Create the PortManager shared by the tests in this module.
+
+    The clients PortManager creates are patched while it is constructed. Tests
+    set the fabric_client and cable_endpoints mocks they need on it.
+
+    Returns:
+        PortManager: the shared PortManager
+    """
+    with mock.patch('sat.cli.swap.ports.SATSession'), \
+            mock.patch('sat.cli.swap.ports.FabricControllerClient'), \
+            mock.patch('sat.cli.swap.ports.CableEndpoints'):
+        return PortManager()
 
 
 class TestGetSwitchPortDataList(unittest.TestCase):
     """Unit test for Switch get_switch_port_data_list()."""
 
-    def setUp(self):
-        """Mock functions called."""
-
-        # A switch with only an edge port
-        self.edge_switch = 'x1000c6r7'
-        # A lone edge port on a switch and the data returned by get_port on it
-        self.lone_edge_port = f'{self.edge_switch}j100p0'
-        self.lone_edge_port_link = f'/fabric/ports/{self.lone_edge_port}'
-        self.lone_edge_port_data = {
-            'conn_port': self.lone_edge_port,
-            'portPolicyLinks': [EDGE_POLICY_LINK]
-        }
-
-        # A switch with only a fabric port
-        self.fabric_switch = 'x1000c1r3'
-        # A lone fabric port on a switch and the data returned by get_port on it
-        self.lone_fabric_port = f'{self.fabric_switch}j20p1'
-        self.lone_fabric_port_link = f'/fabric/ports/{self.lone_fabric_port}'
-        self.lone_fabric_port_data = {
-            'conn_port': self.lone_fabric_port,
-            'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]
+    # A switch with only an edge port
+    EDGE_SWITCH = 'x1000c6r7'
+    EDGE_SWITCH_BMC = 'x1000c6r7b0'
+    EDGE_SWITCH_LINK = '/fabric/switches/x1000c6r7b0'
+    # A lone edge port on a switch and the data returned by get_port on it
+    LONE_EDGE_PORT = 'x1000c6r7j100p0'
+    LONE_EDGE_PORT_LINK = '/fabric/ports/x1000c6r7j100p0'
+    LONE_EDGE_PORT_DATA = {
+        'conn_port': LONE_EDGE_PORT,
+        'portPolicyLinks': [EDGE_POLICY_LINK]
+    }
+
+    # A switch with only a fabric port
+    FABRIC_SWITCH = 'x1000c1r3'
+    FABRIC_SWITCH_BMC = 'x1000c1r3b0'
+    FABRIC_SWITCH_LINK = '/fabric/switches/x1000c1r3b0'
+    # A lone fabric port on a switch and the data returned by get_port on it
+    LONE_FABRIC_PORT = 'x1000c1r3j20p1'
+    LONE_FABRIC_PORT_LINK = '/fabric/ports/x1000c1r3j20p1'
+    LONE_FABRIC_PORT_DATA = {
+        'conn_port': LONE_FABRIC_PORT,
+        'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]
+    }
+
+    # A switch with both fabric and edge ports
+    FABRIC_EDGE_SWITCH = 'x1000c0r1'
+    FABRIC_EDGE_SWITCH_BMC = 'x1000c0r1b0'
+    FABRIC_EDGE_SWITCH_LINK = '/fabric/switches/x1000c0r1b0'
+    FABRIC_PORT_1 = 'x1000c0r1j100p0'
+    FABRIC_PORT_1_LINK = '/fabric/ports/x1000c0r1j100p0'
+    FABRIC_PORT_1_DATA = {
+        'conn_port': FABRIC_PORT_1,
+        'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]
+    }
+    FABRIC_PORT_2 = 'x1000c0r1j100p1'
+    FABRIC_PORT_2_LINK = '/fabric/ports/x1000c0r1j100p1'
+    FABRIC_PORT_2_DATA = {
+        'conn_port': FABRIC_PORT_2,
+        'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]
+    }
+    EDGE_PORT = 'x1000c0r1j20p0'
+    EDGE_PORT_LINK = '/fabric/ports/x1000c0r1j20p0'
+    EDGE_PORT_DATA = {
+        'conn_port': EDGE_PORT,
+        'portPolicyLinks': [EDGE_POLICY_LINK]
+    }
+
+    MOCK_PORTS = {
+        LONE_EDGE_PORT_LINK: LONE_EDGE_PORT_DATA,
+        LONE_FABRIC_PORT_LINK: LONE_FABRIC_PORT_DATA,
+        FABRIC_PORT_1_LINK: FABRIC_PORT_1_DATA,
+        FABRIC_PORT_2_LINK: FABRIC_PORT_2_DATA,
+        EDGE_PORT_LINK: EDGE_PORT_DATA
+    }
+
+    MOCK_SWITCHES = {
+        # Example switch with just an edge port
+        EDGE_SWITCH_LINK: {
+            'edgePortLinks': [LONE_EDGE_PORT_LINK],
+            'fabricPortLinks': []
+        },
+        # Example switch with just fabric ports
+        FABRIC_SWITCH_LINK: {
+            'edgePortLinks': [],
+            'fabricPortLinks': [LONE_FABRIC_PORT_LINK]
+        },
+        # Example switch with fabric and edge ports
+        FABRIC_EDGE_SWITCH_LINK: {
+            'edgePortLinks': [EDGE_PORT_LINK],
+            'fabricPortLinks': [FABRIC_PORT_1_LINK, FABRIC_PORT_2_LINK]
         }
+    }
 
-        # A switch with both fabric and edge ports
-        self.fabric_edge_switch = 'x1000c0r1'
-        self.fabric_port_1 = f'{self.fabric_edge_switch}j100p0'
-        self.fabric_port_1_link = f'/fabric/ports/{self.fabric_port_1}'
-        self.fabric_port_1_data = {
-            'conn_port': self.fabric_port_1,
-            'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]
-        }
-        self.fabric_port_2 = f'{self.fabric_edge_switch}j100p1'
-        self.fabric_port_2_link = f'/fabric/ports/{self.fabric_port_2}'
-        self.fabric_port_2_data = {
-            'conn_port': self.fabric_port_2,
-            'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]
-        }
-        self.edge_port = f'{self.fabric_edge_switch}j20p0'
-        self.edge_port_link = f'/fabric/ports/{self.edge_port}'
-        self.edge_port_data = {
-            'conn_port': self.edge_port,
-            'portPolicyLinks': [EDGE_POLICY_LINK]
-        }
-
-        self.mock_ports = {
-            self.lone_edge_port_link: self.lone_edge_port_data,
-            self.lone_fabric_port_link: self.lone_fabric_port_data,
-            self.fabric_port_1_link: self.fabric_port_1_data,
-            self.fabric_port_2_link: self.fabric_port_2_data,
-            self.edge_port_link: self.edge_port_data
-        }
+    @classmethod
+    def setUpClass(cls):
+        """Get the PortManager shared by the tests in this class."""
+        cls.pm = make_port_manager()
 
-        self.mock_get_port = mock.patch('sat.cli.swap.ports.PortManager.get_port',
-                                        autospec=True).start()
-        self.mock_get_port.side_effect = lambda _, port_xname: self.mock_ports.get(port_xname)
+    def setUp(self):
+        """Mock functions called."""
+        self.mock_get_port = start_patch(self, mock.patch.object(PortManager, 'get_port'))
+        self.mock_get_port.side_effect = self.MOCK_PORTS.get
 
-        self.mock_get_switches = mock.patch('sat.cli.swap.ports.PortManager.get_switches',
-                                            autospec=True).start()
-        self.mock_get_switches.return_value = [
-            f'/fabric/switches/{self.edge_switch}b0',
-            f'/fabric/switches/{self.fabric_switch}b0',
-            f'/fabric/switches/{self.fabric_edge_switch}b0'
-        ]
+        self.mock_get_switches = start_patch(self, mock.patch.object(PortManager, 'get_switches'))
+        self.mock_get_switches.return_value = list(self.MOCK_SWITCHES)
 
-        self.mock_switches = {
-            # Example switch with just an edge port
-            f'/fabric/switches/{self.edge_switch}b0': {
-                'edgePortLinks': [self.lone_edge_port_link],
-                'fabricPortLinks': []
-            },
-            # Example switch with just fabric ports
-            f'/fabric/switches/{self.fabric_switch}b0': {
-                'edgePortLinks': [],
-                'fabricPortLinks': [self.lone_fabric_port_link]
-            },
-            # Example switch with fabric and edge ports
-            f'/fabric/switches/{self.fabric_edge_switch}b0': {
-                'edgePortLinks': [self.edge_port_link],
-                'fabricPortLinks': [self.fabric_port_1_link, self.fabric_port_2_link]
-            }
-        }
-        self.mock_get_switch = mock.patch('sat.cli.swap.ports.PortManager.get_switch',
-                                          autospec=True).start()
-        self.mock_sat_session = mock.patch('sat.cli.swap.ports.SATSession').start()
-        self.mock_get_switch.side_effect = lambda _, switch_xname: self.mock_switches.get(switch_xname)
-        self.pm = PortManager()
+        self.mock_get_switch = start_patch(self, mock.patch.object(PortManager, 'get_switch'))
+        self.mock_get_switch.side_effect = self.MOCK_SWITCHES.get
 
     def test_switch_edge_ports_only(self):
         """Test get_switch_port_data_list with a switch that only has edge ports"""
         # It should work with or without the 'b0' on the end of the switch xname
-        for switch_xname in [self.edge_switch, f'{self.edge_switch}b0']:
-            result = self.pm.get_switch_port_data_list(switch_xname)
-            expected = [{'xname': 'x1000c6r7j100p0',
-                         'port_link': self.lone_edge_port_link,
-                         'policy_links': [EDGE_POLICY_LINK]}]
-            self.assertEqual(result, expected)
+        expected = [{'xname': 'x1000c6r7j100p0',
+                     'port_link': self.LONE_EDGE_PORT_LINK,
+                     'policy_links': [EDGE_POLICY_LINK]}]
+        for switch_xname in [self.EDGE_SWITCH, self.EDGE_SWITCH_BMC]:
+            with self.subTest(switch_xname=switch_xname):
+                result = self.pm.get_switch_port_data_list(switch_xname)
+                self.assertEqual(result, expected)
 
     def test_switch_fabric_ports_only(self):
         """Test get_switch_port_data_list with a switch that only has fabric ports"""
         # It should work with or without the 'b0' on the end of the switch xname
-        for switch_xname in [self.fabric_switch, f'{self.fabric_switch}b0']:
-            result = self.pm.get_switch_port_data_list(switch_xname)
-            expected = [{'xname': self.lone_fabric_port,
-                         'port_link': self.lone_fabric_port_link,
-                         'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]}]
-            self.assertEqual(result, expected)
+        expected = [{'xname': self.LONE_FABRIC_PORT,
+                     'port_link': self.LONE_FABRIC_PORT_LINK,
+                     'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]}]
+        for switch_xname in [self.FABRIC_SWITCH, self.FABRIC_SWITCH_BMC]:
+            with self.subTest(switch_xname=switch_xname):
+                result = self.pm.get_switch_port_data_list(switch_xname)
+                self.assertEqual(result, expected)
 
     def test_switch_fabric_and_edge_ports(self):
         """Test get_switch_port_data_list with a switch with fabric and edge ports"""
         # It should work with or without the 'b0' on the end of the switch xname
-        for switch_xname in [self.fabric_edge_switch, f'{self.fabric_edge_switch}b0']:
-            result = self.pm.get_switch_port_data_list(switch_xname)
-            expected = [
-                {'xname': self.fabric_port_1,
-                 'port_link': self.fabric_port_1_link,
-                 'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-                {'xname': self.fabric_port_2,
-                 'port_link': self.fabric_port_2_link,
-                 'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-                {'xname': self.edge_port,
-                 'port_link': self.edge_port_link,
-                 'policy_links': [EDGE_POLICY_LINK]}
-            ]
-            self.assertCountEqual(result, expected)
-
-    def tearDown(self):
-        mock.patch.stopall()
+        expected = [
+            {'xname': self.FABRIC_PORT_1,
+             'port_link': self.FABRIC_PORT_1_LINK,
+             'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+            {'xname': self.FABRIC_PORT_2,
+             'port_link': self.FABRIC_PORT_2_LINK,
+             'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+            {'xname': self.EDGE_PORT,
+             'port_link': self.EDGE_PORT_LINK,
+             'policy_links': [EDGE_POLICY_LINK]}
+        ]
+        for switch_xname in [self.FABRIC_EDGE_SWITCH, self.FABRIC_EDGE_SWITCH_BMC]:
+            with self.subTest(switch_xname=switch_xname):
+                result = self.pm.get_switch_port_data_list(switch_xname)
+                self.assertEqual(sorted(result, key=operator.itemgetter('xname')),
+                                 sorted(expected, key=operator.itemgetter('xname')))
 
 
 class TestGetJackPortDataList(unittest.TestCase):
     """Unit test for cable get_jack_port_data_list()."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Get the PortManager shared by the tests in this class.
+
+        Each test gives it its own fabric client and cable endpoints mocks.
+        """
+        cls.pm = make_port_manager()
+
     def setUp(self):
         """Mock functions called."""
 
-        self.mock_sat_session = mock.patch('sat.cli.swap.ports.SATSession').start()
-        self.mock_fc_client = mock.patch('sat.cli.swap.ports.FabricControllerClient').start().return_value
-        # The data that will be returned for the ports
-        # Each call for the mock_fc_client will return an item from the list in order
+        # spec_set makes using or setting an attribute the real class does not
+        # have an error.
+        self.mock_fc_client = mock.NonCallableMagicMock(spec_set=FabricControllerClient)
+        self.pm.fabric_client = self.mock_fc_client
+        # The data that will be returned for each port
         # Example URL: https://api-gw-service-nmn.local/apis/fabric-manager/fabric/ports/x9000c1r3j16p0
-        self.mock_fc_client.get.return_value.json.side_effect = [
-            {'id': 'x9000c1r3a0l14',
-             'conn_port': 'x9000c1r3j16p0',
-             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-            {'id': 'x9000c1r3a0l14',
-             'conn_port': 'x9000c1r3j16p1',
-             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-            {'id': 'x9000c3r3a2l13',
-             'conn_port': 'x9000c3r5j16p0',
-             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-            {'id': 'x9000c3r3a0214',
-             'conn_port': 'x9000c3r5j16p1',
-             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-        ]
-
-        self.mock_cable_endpoints = mock.patch('sat.cli.swap.ports.CableEndpoints',
-                                               autospec=True).start().return_value
+        self.set_port_responses({
+            '/fabric/ports/x9000c1r3j16p0': {'id': 'x9000c1r3a0l14',
+                                             'conn_port': 'x9000c1r3j16p0',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+            '/fabric/ports/x9000c1r3j16p1': {'id': 'x9000c1r3a0l14',
+                                             'conn_port': 'x9000c1r3j16p1',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+            '/fabric/ports/x9000c3r5j16p0': {'id': 'x9000c3r3a2l13',
+                                             'conn_port': 'x9000c3r5j16p0',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
+            '/fabric/ports/x9000c3r5j16p1': {'id': 'x9000c3r3a0214',
+                                             'conn_port': 'x9000c3r5j16p1',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]}
+        })
+
+        self.mock_cable_endpoints = mock.NonCallableMagicMock(spec_set=CableEndpoints)
+        self.pm.cable_endpoints = self.mock_cable_endpoints
         self.mock_cable_endpoints.get_cable.side_effect = {
             'src_conn_a': 'x9000c1r3j16',
             'src_conn_b': 'none',
@@ -212,8 +303,7 @@ class TestGetJackPortDataList(unittest.TestCase):
              'x9000c3r5j16']
         ]
 
-        self.mock_get_ports = mock.patch('sat.cli.swap.ports.PortManager.get_ports',
-                                         autospec=True).start()
+        self.mock_get_ports = start_patch(self, mock.patch.object(PortManager, 'get_ports'))
         self.mock_get_ports.return_value = [
             '/fabric/ports/x9000c1r3j16p0',
             '/fabric/ports/x9000c1r3j16p1',
@@ -225,42 +315,63 @@ class TestGetJackPortDataList(unittest.TestCase):
             '/fabric/ports/x9000c3r3j16p1'
         ]
 
-        self.success_expected = [
-            {'xname': 'x9000c1r3j16p0',
-             'port_link': '/fabric/ports/x9000c1r3j16p0',
-             'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-            {'xname': 'x9000c1r3j16p1',
-             'port_link': '/fabric/ports/x9000c1r3j16p1',
-             'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-            {'xname': 'x9000c3r5j16p0',
-             'port_link': '/fabric/ports/x9000c3r5j16p0',
-             'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]},
-            {'xname': 'x9000c3r5j16p1',
-             'port_link': '/fabric/ports/x9000c3r5j16p1',
-             'policy_links': [FABRIC_POLICY_LINK, QOS_POLICY_LINK]}
-        ]
-
         self.mock_cable_endpoints.load_cables_from_p2p_file.return_value = True
         self.mock_cable_endpoints.validate_jacks_using_p2p_file.return_value = True
         self.maxDiff = None
-        self.pm = PortManager()
+
+    def set_port_responses(self, port_responses):
+        """Make the fabric client mock return the given data for each port link.
+
+        Args:
+            port_responses (dict): a mapping from port link to the JSON data
+                the fabric manager returns for that port
+        """
+        self.mock_fc_client.get.side_effect = lambda port_link: mock.Mock(
+            **{'json.return_value': port_responses[port_link]}
+        )
+
+    def assert_ports_fetched(self, port_links):
+        """Assert that the fabric client was used to get exactly the given ports.
+
+        Args:
+            port_links (list): the port links expected to be requested, in the
+                sorted order get_jack_port_data_list() requests them
+        """
+        self.assertEqual([c.args[0] for c in self.mock_fc_client.get.call_args_list],
+                         port_links)
+
+    def assert_call_counts(self, load_cables, validate_jacks, get_cable, get_linked_jack_list, get_ports):
+        """Assert how many times the mocks used by get_jack_port_data_list() were called.
+
+        Args:
+            load_cables (int): expected calls to load_cables_from_p2p_file
+            validate_jacks (int): expected calls to validate_jacks_using_p2p_file
+            get_cable (int): expected calls to get_cable
+            get_linked_jack_list (int): expected calls to get_linked_jack_list
+            get_ports (int): expected calls to PortManager.get_ports
+        """
+        self.assertEqual(
+            (load_cables, validate_jacks, get_cable, get_linked_jack_list, get_ports),
+            (self.mock_cable_endpoints.load_cables_from_p2p_file.call_count,
+             self.mock_cable_endpoints.validate_jacks_using_p2p_file.call_count,
+             self.mock_cable_endpoints.get_cable.call_count,
+             self.mock_cable_endpoints.get_linked_jack_list.call_count,
+             self.mock_get_ports.call_count)
+        )
 
     def test_basic(self):
         """get_jack_port_data_list() with a single jack returns the endpoint data for the jacks"""
 
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16'])
-        self.assertEqual(result, self.success_expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_called()
-        self.mock_cable_endpoints.get_cable.assert_called()
-        self.mock_cable_endpoints.get_linked_jack_list.assert_called()
-        self.mock_get_ports.assert_called()
-        self.mock_fc_client.get.assert_has_calls(
-            [call('/fabric/ports/x9000c1r3j16p0'), call().json(),
-             call('/fabric/ports/x9000c1r3j16p1'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p0'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p1'), call().json()]
-        )
+        self.assertEqual(result, SUCCESS_EXPECTED)
+        self.assert_call_counts(load_cables=1, validate_jacks=1, get_cable=1,
+                                get_linked_jack_list=1, get_ports=1)
+        self.assert_ports_fetched([
+            '/fabric/ports/x9000c1r3j16p0',
+            '/fabric/ports/x9000c1r3j16p1',
+            '/fabric/ports/x9000c3r5j16p0',
+            '/fabric/ports/x9000c3r5j16p1'
+        ])
 
     def test_both_jacks(self):
         """get_jack_port_data_list() with jacks connected by a cable returns the endpoint data for the jacks"""
@@ -282,18 +393,15 @@ class TestGetJackPortDataList(unittest.TestCase):
              'x9000c3r5j16']
         ]
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16', 'x9000c3r5j16'])
-        self.assertEqual(result, self.success_expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_called()
-        self.assertEqual(self.mock_cable_endpoints.get_cable.call_count, 2)
-        self.assertEqual(self.mock_cable_endpoints.get_linked_jack_list.call_count, 2)
-        self.mock_get_ports.assert_called()
-        self.mock_fc_client.get.assert_has_calls(
-            [call('/fabric/ports/x9000c1r3j16p0'), call().json(),
-             call('/fabric/ports/x9000c1r3j16p1'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p0'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p1'), call().json()]
-        )
+        self.assertEqual(result, SUCCESS_EXPECTED)
+        self.assert_call_counts(load_cables=1, validate_jacks=1, get_cable=2,
+                                get_linked_jack_list=2, get_ports=1)
+        self.assert_ports_fetched([
+            '/fabric/ports/x9000c1r3j16p0',
+            '/fabric/ports/x9000c1r3j16p1',
+            '/fabric/ports/x9000c3r5j16p0',
+            '/fabric/ports/x9000c3r5j16p1'
+        ])
 
     def test_invalid_jack_xname(self):
         """get_jack_port_data_list() with an invalid xname"""
@@ -301,11 +409,8 @@ class TestGetJackPortDataList(unittest.TestCase):
         expected = None
         result = self.pm.get_jack_port_data_list(['x9000c1r3'])
         self.assertEqual(result, expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_not_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_not_called()
-        self.mock_cable_endpoints.get_cable.assert_not_called()
-        self.mock_cable_endpoints.get_linked_jack_list.assert_not_called()
-        self.mock_get_ports.assert_not_called()
+        self.assert_call_counts(load_cables=0, validate_jacks=0, get_cable=0,
+                                get_linked_jack_list=0, get_ports=0)
 
     def test_no_p2p_file(self):
         """get_jack_port_data_list() with no p2p file"""
@@ -314,11 +419,8 @@ class TestGetJackPortDataList(unittest.TestCase):
         expected = None
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16'])
         self.assertEqual(result, expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_not_called()
-        self.mock_cable_endpoints.get_cable.assert_not_called()
-        self.mock_cable_endpoints.get_linked_jack_list.assert_not_called()
-        self.mock_get_ports.assert_not_called()
+        self.assert_call_counts(load_cables=1, validate_jacks=0, get_cable=0,
+                                get_linked_jack_list=0, get_ports=0)
 
     def test_no_p2p_file_with_force(self):
         """get_jack_port_data_list() with no p2p file with force"""
@@ -334,15 +436,12 @@ class TestGetJackPortDataList(unittest.TestCase):
         ]
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16'], force=True)
         self.assertEqual(result, expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_not_called()
-        self.mock_cable_endpoints.get_cable.assert_not_called()
-        self.mock_cable_endpoints.get_linked_jack_list.assert_not_called()
-        self.mock_get_ports.assert_called()
-        self.mock_fc_client.get.assert_has_calls(
-            [call('/fabric/ports/x9000c1r3j16p0'), call().json(),
-             call('/fabric/ports/x9000c1r3j16p1'), call().json()]
-        )
+        self.assert_call_counts(load_cables=1, validate_jacks=0, get_cable=0,
+                                get_linked_jack_list=0, get_ports=1)
+        self.assert_ports_fetched([
+            '/fabric/ports/x9000c1r3j16p0',
+            '/fabric/ports/x9000c1r3j16p1'
+        ])
 
     def test_jack_not_valid_using_p2p_file(self):
         """get_jack_port_data_list() with jack not valid using p2p file"""
@@ -351,29 +450,23 @@ class TestGetJackPortDataList(unittest.TestCase):
         expected = None
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16'])
         self.assertEqual(result, expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_called()
-        self.mock_cable_endpoints.get_cable.assert_not_called()
-        self.mock_cable_endpoints.get_linked_jack_list.assert_not_called()
-        self.mock_get_ports.assert_not_called()
+        self.assert_call_counts(load_cables=1, validate_jacks=1, get_cable=0,
+                                get_linked_jack_list=0, get_ports=0)
 
     def test_jack_not_valid_using_p2p_file_with_force(self):
         """get_jack_port_data_list() with jack not valid using p2p file with force"""
 
         self.mock_cable_endpoints.validate_jacks_using_p2p_file.return_value = False
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16'], force=True)
-        self.assertEqual(result, self.success_expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_called()
-        self.assertEqual(self.mock_cable_endpoints.get_cable.call_count, 1)
-        self.assertEqual(self.mock_cable_endpoints.get_linked_jack_list.call_count, 1)
-        self.mock_get_ports.assert_called()
-        self.mock_fc_client.get.assert_has_calls(
-            [call('/fabric/ports/x9000c1r3j16p0'), call().json(),
-             call('/fabric/ports/x9000c1r3j16p1'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p0'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p1'), call().json()]
-        )
+        self.assertEqual(result, SUCCESS_EXPECTED)
+        self.assert_call_counts(load_cables=1, validate_jacks=1, get_cable=1,
+                                get_linked_jack_list=1, get_ports=1)
+        self.assert_ports_fetched([
+            '/fabric/ports/x9000c1r3j16p0',
+            '/fabric/ports/x9000c1r3j16p1',
+            '/fabric/ports/x9000c3r5j16p0',
+            '/fabric/ports/x9000c3r5j16p1'
+        ])
 
     def test_jacks_two_cables_with_force(self):
         """get_jack_port_data_list() with jacks for two separate cables with force"""
@@ -395,75 +488,46 @@ class TestGetJackPortDataList(unittest.TestCase):
             ['x9000c1r3j18',
              'x9000c3r3j16']
         ]
-        self.mock_fc_client.get.return_value.json.side_effect = [
-            {'id': 'x9000c1r3a0l14',
-             'conn_port': 'x9000c1r3j16p0',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c1r3a0l15',
-             'conn_port': 'x9000c1r3j16p1',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c1r3a0l16',
-             'conn_port': 'x9000c1r3j18p0',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c1r3a0l17',
-             'conn_port': 'x9000c1r3j18p1',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c3r3a2l18',
-             'conn_port': 'x9000c3r3j16p0',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c3r3a0219',
-             'conn_port': 'x9000c3r3j16p1',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c3r3a2l13',
-             'conn_port': 'x9000c3r5j16p0',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]},
-            {'id': 'x9000c3r3a0214',
-             'conn_port': 'x9000c3r5j16p1',
-             'portPolicyLinks': [FABRIC_POLICY_LINK]}
-        ]
-        expected = [
-            {'xname': 'x9000c1r3j16p0',
-             'port_link': '/fabric/ports/x9000c1r3j16p0',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c1r3j16p1',
-             'port_link': '/fabric/ports/x9000c1r3j16p1',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c1r3j18p0',
-             'port_link': '/fabric/ports/x9000c1r3j18p0',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c1r3j18p1',
-             'port_link': '/fabric/ports/x9000c1r3j18p1',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c3r3j16p0',
-             'port_link': '/fabric/ports/x9000c3r3j16p0',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c3r3j16p1',
-             'port_link': '/fabric/ports/x9000c3r3j16p1',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c3r5j16p0',
-             'port_link': '/fabric/ports/x9000c3r5j16p0',
-             'policy_links': [FABRIC_POLICY_LINK]},
-            {'xname': 'x9000c3r5j16p1',
-             'port_link': '/fabric/ports/x9000c3r5j16p1',
-             'policy_links': [FABRIC_POLICY_LINK]}
-        ]
+        self.set_port_responses({
+            '/fabric/ports/x9000c1r3j16p0': {'id': 'x9000c1r3a0l14',
+                                             'conn_port': 'x9000c1r3j16p0',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c1r3j16p1': {'id': 'x9000c1r3a0l15',
+                                             'conn_port': 'x9000c1r3j16p1',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c1r3j18p0': {'id': 'x9000c1r3a0l16',
+                                             'conn_port': 'x9000c1r3j18p0',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c1r3j18p1': {'id': 'x9000c1r3a0l17',
+                                             'conn_port': 'x9000c1r3j18p1',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c3r3j16p0': {'id': 'x9000c3r3a2l18',
+                                             'conn_port': 'x9000c3r3j16p0',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c3r3j16p1': {'id': 'x9000c3r3a0219',
+                                             'conn_port': 'x9000c3r3j16p1',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c3r5j16p0': {'id': 'x9000c3r3a2l13',
+                                             'conn_port': 'x9000c3r5j16p0',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]},
+            '/fabric/ports/x9000c3r5j16p1': {'id': 'x9000c3r3a0214',
+                                             'conn_port': 'x9000c3r5j16p1',
+                                             'portPolicyLinks': [FABRIC_POLICY_LINK]}
+        })
         result = self.pm.get_jack_port_data_list(['x9000c1r3j16', 'x9000c1r3j18'], force=True)
-        self.assertEqual(result, expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_called()
-        self.assertEqual(self.mock_cable_endpoints.get_cable.call_count, 2)
-        self.assertEqual(self.mock_cable_endpoints.get_linked_jack_list.call_count, 2)
-        self.mock_get_ports.assert_called()
-        self.mock_fc_client.get.assert_has_calls(
-            [call('/fabric/ports/x9000c1r3j16p0'), call().json(),
-             call('/fabric/ports/x9000c1r3j16p1'), call().json(),
-             call('/fabric/ports/x9000c1r3j18p0'), call().json(),
-             call('/fabric/ports/x9000c1r3j18p1'), call().json(),
-             call('/fabric/ports/x9000c3r3j16p0'), call().json(),
-             call('/fabric/ports/x9000c3r3j16p1'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p0'), call().json(),
-             call('/fabric/ports/x9000c3r5j16p1'), call().json()]
-        )
+        self.assertEqual(result, TWO_CABLES_EXPECTED)
+        self.assert_call_counts(load_cables=1, validate_jacks=1, get_cable=2,
+                                get_linked_jack_list=2, get_ports=1)
+        self.assert_ports_fetched([
+            '/fabric/ports/x9000c1r3j16p0',
+            '/fabric/ports/x9000c1r3j16p1',
+            '/fabric/ports/x9000c1r3j18p0',
+            '/fabric/ports/x9000c1r3j18p1',
+            '/fabric/ports/x9000c3r3j16p0',
+            '/fabric/ports/x9000c3r3j16p1',
+            '/fabric/ports/x9000c3r5j16p0',
+            '/fabric/ports/x9000c3r5j16p1'
+        ])
 
     def test_jack_not_in_port_list(self):
         """get_jack_port_data_list() with jack not in port list"""
@@ -472,66 +536,58 @@ class TestGetJackPortDataList(unittest.TestCase):
         self.mock_get_ports.return_value = []
         result = self.pm.get_jack_port_data_list(['x9000c1r3j99'])
         self.assertEqual(result, expected)
-        self.mock_cable_endpoints.load_cables_from_p2p_file.assert_called()
-        self.mock_cable_endpoints.validate_jacks_using_p2p_file.assert_called()
-        self.assertEqual(self.mock_cable_endpoints.get_cable.call_count, 1)
-        self.assertEqual(self.mock_cable_endpoints.get_linked_jack_list.call_count, 1)
-        self.mock_get_ports.assert_called()
+        self.assert_call_counts(load_cables=1, validate_jacks=1, get_cable=1,
+                                get_linked_jack_list=1, get_ports=1)
 
-    def tearDown(self):
-        mock.patch.stopall()
 
-
-class TestCreateOfflinePortPolicy(ExtendedTestCase):
+class TestCreateOfflinePortPolicy(unittest.TestCase):
     """Unit test for Switch create_offline_port_policy()."""
 
-    def setUp(self):
-        """Mock functions called."""
+    @classmethod
+    def setUpClass(cls):
+        """Mock functions called.
 
-        self.mock_sat_session = mock.Mock()
-        self.mock_fc_client_cls = mock.patch('sat.cli.swap.ports.SATSession').start()
+        The patches are started once for all tests in this class, and the mocks
+        are reset before each test.
+        """
+        cls.mock_fc_response = mock.Mock()
+        cls.mock_fc_response.json.return_value = {}
+        cls.mock_fc_client = mock.NonCallableMagicMock(spec_set=FabricControllerClient)
 
-        self.mock_fc_response = mock.Mock()
-        self.mock_fc_response.json.return_value = {}
-        self.mock_fc_client = mock.Mock()
-        self.mock_fc_client.post.return_value = self.mock_fc_response
-        self.mock_fc_client_cls = mock.patch('sat.cli.swap.ports.FabricControllerClient',
-                                             return_value=self.mock_fc_client).start()
+        cls.mock_get_port_policies = mock.patch.object(PortManager, 'get_port_policies').start()
 
-        self.mock_get_port_policies = mock.patch('sat.cli.swap.ports.PortManager.get_port_policies',
-                                                 autospec=True).start()
+        mock.patch('sat.cli.swap.ports.json').start()
+        cls.pm = make_port_manager()
 
-        self.offline_edge_policy = os.path.join(os.path.dirname(EDGE_POLICY_LINK),
-                                                f'sat-offline-{os.path.basename(EDGE_POLICY_LINK)}')
+    @classmethod
+    def tearDownClass(cls):
+        mock.patch.stopall()
+
+    def setUp(self):
+        """Reset the mocks used by each test."""
+        # Also clear anything configured on the fabric client by other tests.
+        self.mock_fc_client.reset_mock(return_value=True, side_effect=True)
+        self.mock_fc_client.post.return_value = self.mock_fc_response
+        self.pm.fabric_client = self.mock_fc_client
+        self.mock_get_port_policies.reset_mock()
         self.mock_get_port_policies.return_value = [
             FABRIC_POLICY_LINK,
             EDGE_POLICY_LINK,
-            self.offline_edge_policy
+            OFFLINE_EDGE_POLICY_LINK
         ]
-
-        self.mock_json_dumps = mock.patch('json.dumps', autospec=True).start()
-        self.pm = PortManager()
-
-    def tearDown(self):
-        mock.patch.stopall()
+        self.mock_logger = start_patch(self, mock.patch('sat.cli.swap.ports.LOGGER'))
 
     def test_basic(self):
         """Test create_offline_port_policy() that already exists"""
-        with self.assertLogs(level=logging.INFO) as logs:
-            self.pm.create_offline_port_policy(EDGE_POLICY_LINK, 'sat-offline-')
-        self.assert_in_element(f'Using existing offline policy: {self.offline_edge_policy}',
-                               logs.output)
+        self.pm.create_offline_port_policy(EDGE_POLICY_LINK, 'sat-offline-')
+        self.mock_logger.info.assert_any_call(f'Using existing offline policy: {OFFLINE_EDGE_POLICY_LINK}')
         self.mock_get_port_policies.assert_called_once()
         self.mock_fc_client.post.assert_not_called()
 
     def test_new_policy(self):
         """Test create_offline_port_policy() that doesn't already exist"""
-        with self.assertLogs(level=logging.DEBUG) as logs:
-            self.pm.create_offline_port_policy(FABRIC_POLICY_LINK, 'sat-offline-')
-        offline_fabric_policy = os.path.join(os.path.dirname(FABRIC_POLICY_LINK),
-                                             f'sat-offline-{os.path.basename(FABRIC_POLICY_LINK)}')
-        self.assert_in_element(f'Creating offline policy: {offline_fabric_policy}',
-                               logs.output)
+        self.pm.create_offline_port_policy(FABRIC_POLICY_LINK, 'sat-offline-')
+        self.mock_logger.debug.assert_any_call(f'Creating offline policy: {OFFLINE_FABRIC_POLICY_LINK}')
         self.mock_get_port_policies.assert_called_once()
         self.mock_fc_client.post.assert_called_once()
 
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020-2022, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020-2022, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -71,7 +71,7 @@ class TestCableSwapper(ExtendedTestCase):
 
         self.mock_pester = mock.patch('sat.cli.swap.swap.pester', autospec=True).start()
         self.mock_pester.return_value = True
-        self.mock_print = mock.patch('builtins.print', autospec=True).start()
+        self.mock_print = mock.patch('builtins.print').start()
         self.mock_output_json = mock.patch('sat.cli.swap.swap.output_json', autospec=True).start()
 
         # Type hint quiets PyCharm when 'action' value is set to a str in tests
@@ -350,7 +350,7 @@ class TestSwitchSwapper(ExtendedTestCase):
         ]
         self.mock_pester = mock.patch('sat.cli.swap.swap.pester', autospec=True).start()
         self.mock_pester.return_value = True
-        self.mock_print = mock.patch('builtins.print', autospec=True).start()
+        self.mock_print = mock.patch('builtins.print').start()
         self.mock_output_json = mock.patch('sat.cli.swap.swap.output_json', autospec=True).start()
 
         # Type hint quiets PyCharm when 'action' value is set to a str in tests
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -75,7 +75,7 @@ class TestDoXname2nid(ExtendedTestCase):
         self.mock_hsm_client.get_node_components.return_value = self.node_data
 
         self.mock_sat_session = mock.patch('sat.cli.xname2nid.main.SATSession').start()
-        self.mock_print = mock.patch('builtins.print', autospec=True).start()
+        self.mock_print = mock.patch('builtins.print').start()
 
         self.fake_args = Namespace()
         set_options(self.fake_args)
@@ -46,7 +46,8 @@ from sat.config import (
     read_config_value_file,
     validate_bos_api_version,
     validate_cfs_api_version,
-    validate_log_level
+    validate_log_level,
+    validate_max_parallel_ssh
 )
 from tests.common import ExtendedTestCase
 
@@ -102,6 +103,23 @@ class TestValidateCfsApiVersion(unittest.TestCase):
                     validate_cfs_api_version(version)
 
 
+class TestValidateMaxParallelSsh(unittest.TestCase):
+    """Tests for validate_max_parallel_ssh function"""
+
+    def test_validate_max_parallel_ssh_valid(self):
+        """Test that positive values are valid for max_parallel_ssh"""
+        for value in [1, 16, 100]:
+            with self.subTest(value=value):
+                validate_max_parallel_ssh(value)
+
+    def test_validate_max_parallel_ssh_invalid(self):
+        """Test that values below 1 are not allowed for max_parallel_ssh"""
+        for value in [0, -1, -16]:
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(ConfigValidationError, 'must be at least 1'):
+                    validate_max_parallel_ssh(value)
+
+
 class TestOptionValue(unittest.TestCase):
     """Test we get the right values from _option_value."""
     def setUp(self):
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2021, 2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2021, 2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -27,7 +27,9 @@ Tests for output filtering mechanisms.
 
 from collections import OrderedDict
 import copy
+import fnmatch
 from functools import wraps
+import operator
 import os
 import random
 import time
@@ -101,6 +103,32 @@ class TestFilterQueryStrings(unittest.TestCase):
         for guess in ['sound', 'found', 'tough', 'something else']:
             self.assertFalse(filter_fn({'guess': guess}))
 
+    @with_filter('guess != blo?d', ['guess'])
+    def test_query_with_negated_wildcard(self, filter_fn):
+        """Test a query which excludes values matching a wildcard."""
+        for guess in ['bloodhound', 'block', 'blot', 'apple']:
+            self.assertTrue(filter_fn({'guess': guess}))
+
+        for guess in ['blood', 'blond', 'blo-d']:
+            self.assertFalse(filter_fn({'guess': guess}))
+
+    @with_filter('name = x3000C0S*', ['name'])
+    def test_query_with_wildcard_ignores_case(self, filter_fn):
+        """Test that a query with a wildcard ignores the case of the pattern and value."""
+        for name in ['x3000c0s1b0n0', 'X3000C0S1B0N0', 'x3000C0s17']:
+            self.assertTrue(filter_fn({'name': name}))
+
+        self.assertFalse(filter_fn({'name': 'x3000c0r15'}))
+
+    def test_wildcard_translated_once(self):
+        """Test that a wildcard pattern is only translated once, not for every row."""
+        filtering._compile_wildcard.cache_clear()
+        with mock.patch('sat.filtering.fnmatch.translate', wraps=fnmatch.translate) as mock_translate:
+            filter_fn = filtering.parse_query_string('foo = b*', ['foo'])
+            results = [filter_fn({'foo': foo}) for foo in ['bar', 'baz', 'quux']]
+        self.assertEqual([True, True, False], results)
+        mock_translate.assert_called_once_with('b*')
+
     @with_filter('mem_cap = 192', ['memory_capacity'])
     def test_query_subseq_key(self, filter_fn):
         """Test querying against key subsequencing."""
@@ -143,6 +171,19 @@ class TestFilterQueryStrings(unittest.TestCase):
         with self.assertRaises(TypeError):
             filter_fn({'foo': 'bar'})
 
+    @with_filter('foo > 20', ['foo'])
+    def test_cant_compare_numbers_and_strings_after_numbers(self, filter_fn):
+        """Test comparing a string gives a clear error after rows with numbers were compared."""
+        self.assertTrue(filter_fn({'foo': 30}))
+        with self.assertRaisesRegex(TypeError, "Cannot filter value of type 'str' with value of type 'float'."):
+            filter_fn({'foo': 'MISSING'})
+
+    @with_filter('foo != 20', ['foo'])
+    def test_inequality_with_numbers_and_strings(self, filter_fn):
+        """Test comparing inequality between numbers and strings works."""
+        self.assertFalse(filter_fn({'foo': 20}))
+        self.assertTrue(filter_fn({'foo': 'bar'}))
+
     @with_filter('foo = 20', ['foo'])
     def test_equality_with_numbers_and_strings(self, filter_fn):
         """Test comparing equality between numbers and strings works."""
@@ -196,6 +237,39 @@ class TestFilterQueryStrings(unittest.TestCase):
         self.assertTrue(filtering.CombinedFilter(any, *true_fns)(val))
         self.assertFalse(filtering.CombinedFilter(any, *false_fns)(val))
 
+    def test_combined_filters_many(self):
+        """Test combining more than two filtering functions with boolean combinators."""
+        always_true = filtering.CustomFilter(mock.MagicMock(return_value=True), {'some_field'})
+        always_false = filtering.CustomFilter(mock.MagicMock(return_value=False), {'some_field'})
+        val = mock.MagicMock()
+
+        for fns, expected_all, expected_any in [
+            ((always_true, always_true, always_true), True, True),
+            ((always_true, always_false, always_true), False, True),
+            ((always_false, always_false, always_false), False, False),
+        ]:
+            self.assertIs(expected_all, filtering.CombinedFilter(all, *fns)(val))
+            self.assertIs(expected_any, filtering.CombinedFilter(any, *fns)(val))
+
+    def test_combined_filters_short_circuit(self):
+        """Test that combined filters stop calling filters once the result is known."""
+        for combinator, result in [(all, False), (any, True)]:
+            for num_fns in [2, 3]:
+                first_fn = mock.Mock(return_value=result)
+                other_fns = [mock.Mock() for _ in range(num_fns - 1)]
+                combined = filtering.CombinedFilter(combinator, filtering.CustomFilter(first_fn, {'foo'}),
+                                                    *[filtering.CustomFilter(fn, {'foo'}) for fn in other_fns])
+                self.assertIs(result, combined({'foo': 'bar'}))
+                for fn in other_fns:
+                    fn.assert_not_called()
+
+    def test_combined_filters_custom_combinator(self):
+        """Test combining filtering functions with a combinator other than all or any."""
+        filter_fns = [filtering.CustomFilter(mock.Mock(return_value=result), {'foo'})
+                      for result in [True, False, True]]
+        combined = filtering.CombinedFilter(lambda results: sum(results) == 2, *filter_fns)
+        self.assertTrue(combined({'foo': 'bar'}))
+
     def test_custom_filters(self):
         """Test that custom filters filter rows according to their given filter function."""
         filter_result_cache = {}
@@ -211,11 +285,113 @@ class TestFilterQueryStrings(unittest.TestCase):
         for row in [{'num': i} for i in range(20)]:
             self.assertEqual(filter_fn(row), custom_filter(row))
 
+    def test_comparison_built_once(self):
+        """Test that the query key and comparison function are only resolved on the first row."""
+        with mock.patch('sat.filtering.match_query_key', return_value='memory') as mock_match, \
+                mock.patch('sat.filtering._get_cmpr_fn', wraps=filtering._get_cmpr_fn) as mock_get_cmpr_fn:
+            filter_fn = filtering.parse_query_string('mem > 100', ['memory'])
+            results = [filter_fn({'memory': mem}) for mem in [50, 150, 250]]
+        self.assertEqual([False, True, True], results)
+        mock_match.assert_called_once_with('mem', ['memory'])
+        mock_get_cmpr_fn.assert_called_once_with('>', is_number=True)
+
+    def test_wildcard_comparison_built_once(self):
+        """Test that wildcard comparisons use the comparison function from _get_cmpr_fn."""
+        with mock.patch('sat.filtering._get_cmpr_fn', wraps=filtering._get_cmpr_fn) as mock_get_cmpr_fn:
+            filter_fn = filtering.parse_query_string('foo != 1*', ['foo'])
+            results = [filter_fn({'foo': foo}) for foo in [10, 'abc', '1a']]
+        self.assertEqual([False, True, False], results)
+        mock_get_cmpr_fn.assert_called_once_with('!=', is_number=False)
+
+    def test_combined_filter_compiled_once(self):
+        """Test that the filters in a combined filter are compiled once on the first row."""
+        filter_fn = filtering.parse_query_string('foo = bar and baz > 10', ['foo', 'baz'])
+        with mock.patch.object(filtering.ComparisonFilter, 'compile',
+                               autospec=True, side_effect=filtering.ComparisonFilter.compile) as mock_compile:
+            results = [filter_fn({'foo': foo, 'baz': baz})
+                       for foo, baz in [('bar', 11), ('bar', 9), ('quux', 11)]]
+        self.assertEqual([True, False, False], results)
+        self.assertEqual(2, mock_compile.call_count)
+
+    def test_combined_filter_with_custom_filter(self):
+        """Test that a combined filter calls the function of a custom filter it contains."""
+        custom_fn = mock.Mock(return_value=True)
+        combined_filter = filtering.CombinedFilter(
+            all, filtering.parse_query_string('foo = bar', ['foo']),
+            filtering.CustomFilter(custom_fn, {'foo'})
+        )
+        row = {'foo': 'bar'}
+        self.assertTrue(combined_filter(row))
+        custom_fn.assert_called_once_with(row)
+
     def test_get_cmpr_fn_value_error(self):
         """Test _get_cmpr_fn raises a ValueError for a non-comparator."""
         with self.assertRaises(ValueError):
             filtering._get_cmpr_fn('not a comparator')
 
+    def test_str_eq_cmpr(self):
+        """Test _str_eq_cmpr matches values against wildcards, ignoring case."""
+        for name, pattern, expected in [('Bar', 'b*', True), ('bar', 'B?R', True), (2020, '20*', True),
+                                        ('quux', 'b*', False), ('foobar', 'bar', False)]:
+            self.assertIs(expected, filtering._str_eq_cmpr(name, pattern))
+
+    def test_str_eq_cmpr_pattern_cached(self):
+        """Test _str_eq_cmpr only translates each wildcard pattern once."""
+        filtering._compile_wildcard.cache_clear()
+        with mock.patch('sat.filtering.fnmatch.translate', wraps=fnmatch.translate) as mock_translate:
+            for name in ['bar', 'baz', 'quux']:
+                filtering._str_eq_cmpr(name, 'B*')
+        mock_translate.assert_called_once_with('b*')
+
+    def test_get_cmpr_fn_numbers(self):
+        """Test _get_cmpr_fn returns the built-in operators for numbers."""
+        for fn_sym, expected_fn in [('>', operator.gt), ('>=', operator.ge), ('<', operator.lt),
+                                    ('<=', operator.le), ('!=', operator.ne), ('=', operator.eq)]:
+            self.assertIs(expected_fn, filtering._get_cmpr_fn(fn_sym, is_number=True))
+
+    def test_get_cmpr_fn_strings(self):
+        """Test _get_cmpr_fn returns wildcard matching functions for string equality."""
+        self.assertIs(operator.gt, filtering._get_cmpr_fn('>'))
+        self.assertTrue(filtering._get_cmpr_fn('=')('Bar', 'b*'))
+        self.assertFalse(filtering._get_cmpr_fn('!=')('Bar', 'b*'))
+        self.assertTrue(filtering._get_cmpr_fn('!=')('quux', 'b*'))
+
+
+class TestQueryStringCaching(unittest.TestCase):
+    """Tests for caching the parsing of query strings."""
+
+    def setUp(self):
+        filtering._parse_query_tree.cache_clear()
+        self.mock_parse_strict = mock.patch.object(filtering._expr, 'parse_strict',
+                                                   wraps=filtering._expr.parse_strict).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        filtering._parse_query_tree.cache_clear()
+
+    def test_repeated_query_parsed_once(self):
+        """Test that a repeated query string is only parsed once."""
+        first_filter = filtering.parse_query_string('foo = bar and baz > 10', ['foo', 'baz'])
+        second_filter = filtering.parse_query_string('foo = bar and baz > 10', ['foo', 'baz'])
+        self.mock_parse_strict.assert_called_once_with('foo = bar and baz > 10')
+        for row in [{'foo': 'bar', 'baz': 11}, {'foo': 'bar', 'baz': 9}]:
+            self.assertEqual(first_filter(row), second_filter(row))
+
+    def test_cached_query_different_fields(self):
+        """Test that a cached query is matched against the fields of each call."""
+        food_filter = filtering.parse_query_string('f = spam', ['food', 'frobnicator'])
+        frob_filter = filtering.parse_query_string('f = spam', ['frobnicator', 'food'])
+        self.mock_parse_strict.assert_called_once_with('f = spam')
+        self.assertEqual({'food'}, food_filter.get_filtered_fields())
+        self.assertEqual({'frobnicator'}, frob_filter.get_filtered_fields())
+
+    def test_bad_query_string_not_cached(self):
+        """Test that a bad query string raises ParseError each time it is parsed."""
+        for _ in range(2):
+            with self.assertRaises(ParseError):
+                filtering.parse_query_string('foo =', ['foo'])
+        self.assertEqual(2, self.mock_parse_strict.call_count)
+
 
 class TestGetFilteredFields(unittest.TestCase):
     def test_get_filtered_fields_single_value(self):
@@ -255,6 +431,14 @@ class TestGetFilteredFields(unittest.TestCase):
 
         self.assertEqual(parent_filter.get_filtered_fields(), child_fields | sibling_fields | parent_fields)
 
+    def test_custom_filter_fields_children_iterable(self):
+        """Test that CustomFilter children can be given as any iterable."""
+        child_filters = (filtering.CustomFilter(None, {field}) for field in ['baz', 'giblet'])
+        parent_filter = filtering.CustomFilter(None, {'foo'}, children=child_filters)
+
+        for _ in range(2):
+            self.assertEqual({'foo', 'baz', 'giblet'}, parent_filter.get_filtered_fields())
+
 
 class TestComparisonFilterEquality(unittest.TestCase):
     """Tests for equality checking on ComparisonFilters."""
@@ -320,6 +504,38 @@ class TestParseMultipleStrings(unittest.TestCase):
         for compiled_filter in compiled_filters:
             self.assertIn(compiled_filter, combined_filter.filter_fns)
 
+    def test_multiple_filters_compiled_flat(self):
+        """Test that the comparisons of multiple 'and' query strings are combined in one 'and'."""
+        combined_filter = filtering.parse_multiple_query_strings(
+            ['foo=bar and baz>1', 'baz<10 and foo=b*'], self.headings
+        )
+        with mock.patch.object(filtering.CombinedFilter, 'compile', autospec=True,
+                               side_effect=filtering.CombinedFilter.compile) as mock_compile:
+            self.assertTrue(combined_filter({'foo': 'bar', 'baz': 5}))
+            self.assertFalse(combined_filter({'foo': 'bar', 'baz': 10}))
+        mock_compile.assert_called_once_with(combined_filter)
+
+    def test_multiple_filters_with_or_compiled(self):
+        """Test that 'or' query strings are not flattened into the combining 'and'."""
+        combined_filter = filtering.parse_multiple_query_strings(
+            ['foo=bar or foo=quux', 'baz>1'], self.headings
+        )
+        self.assertTrue(combined_filter({'foo': 'quux', 'baz': 5}))
+        self.assertFalse(combined_filter({'foo': 'spam', 'baz': 5}))
+        self.assertFalse(combined_filter({'foo': 'bar', 'baz': 0}))
+
+    def test_parsing_duplicate_filters(self):
+        """Test that a query string given more than once is only used once"""
+        combined_filter = filtering.parse_multiple_query_strings(['foo=bar', 'baz=quux', 'foo=bar'],
+                                                                 self.headings)
+        self.assertEqual([filtering.parse_query_string(f, self.headings) for f in ['foo=bar', 'baz=quux']],
+                         list(combined_filter.filter_fns))
+
+    def test_parsing_duplicate_single_filter(self):
+        """Test that a single query string given more than once gives a simple filter function"""
+        self.assertIsInstance(filtering.parse_multiple_query_strings(['foo=bar', 'foo=bar'], ['foo']),
+                              filtering.ComparisonFilter)
+
     def test_parsing_just_custom_filters(self):
         """Test that custom filters are passed through if just one is given"""
         def rubber_stamp(_):
@@ -376,6 +592,17 @@ class TestRemoveConstantValues(unittest.TestCase):
         const_removed = filtering.remove_constant_values(people, 'Morrison')
         self.assertEqual(people, const_removed)
 
+    def test_no_constant_values_not_copied(self):
+        """Test remove_constant_values returns the given dicts when no keys are removed."""
+        people = [
+            OrderedDict([('first', 'Jim'), ('last', 'Morrison')]),
+            OrderedDict([('first', 'Janis'), ('last', 'Joplin')])
+        ]
+        const_removed = filtering.remove_constant_values(people, 'Morrison')
+        self.assertIsNot(people, const_removed)
+        for person, result in zip(people, const_removed):
+            self.assertIs(person, result)
+
     def test_common_but_not_constant_values(self):
         """Test remove_constant_values with some common but not constant values."""
         people = [
@@ -404,6 +631,8 @@ class TestRemoveConstantValues(unittest.TestCase):
         ]
         const_removed = filtering.remove_constant_values(people, 'Jim')
         self.assertEqual(expected_result, const_removed)
+        # The given dicts should not be modified
+        self.assertEqual('Jim', people[0]['first'])
 
     def test_all_constant_values(self):
         """Test remove_constant_values with all keys having the same constant value."""
@@ -422,6 +651,25 @@ class TestRemoveConstantValues(unittest.TestCase):
         const_removed = filtering.remove_constant_values(people, 'Morrison')
         self.assertEqual(people, const_removed)
 
+    def test_single_key(self):
+        """Test remove_constant_values with dicts which have a single key."""
+        people = [{'first': 'Jim'}, {'first': 'Jim'}]
+        self.assertEqual([{}, {}], filtering.remove_constant_values(people, 'Jim'))
+        self.assertEqual(people, filtering.remove_constant_values(people, 'Janis'))
+
+    def test_no_keys(self):
+        """Test remove_constant_values with empty dicts."""
+        self.assertEqual([{}, {}], filtering.remove_constant_values([{}, {}], 'Jim'))
+
+    def test_different_key_order(self):
+        """Test remove_constant_values with dicts whose keys are in different orders."""
+        people = [
+            {'first': 'Jim', 'last': 'Morrison'},
+            {'last': 'Henson', 'first': 'Jim'},
+        ]
+        expected_result = [{'last': 'Morrison'}, {'last': 'Henson'}]
+        self.assertEqual(expected_result, filtering.remove_constant_values(people, 'Jim'))
+
     def test_empty_list(self):
         """Test remove_constant_values with an empty list."""
         empty = []
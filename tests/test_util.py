@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2024, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -814,6 +814,47 @@ class TestSubsequenceMatching(unittest.TestCase):
             self.assertFalse(util.is_subsequence(needle, haystack))
 
 
+class TestMatchQueryKey(unittest.TestCase):
+    """Tests for the match_query_key function."""
+    def setUp(self):
+        self.headings = ['memory_capacity', 'memory_type', 'name']
+
+    def test_exact_match(self):
+        """Test that an exact match is preferred over subsequence matches."""
+        self.assertEqual('Name', util.match_query_key('name', ['Name', 'nickname']))
+
+    def test_subsequence_match(self):
+        """Test matching a subsequence of a single heading."""
+        self.assertEqual('memory_capacity', util.match_query_key('mem_cap', self.headings))
+
+    def test_no_match(self):
+        """Test that None is returned when no heading matches."""
+        self.assertIsNone(util.match_query_key('serial', self.headings))
+
+    def test_ambiguous_match_warns_each_time(self):
+        """Test that an ambiguous query warns on every call, even when the match is cached."""
+        for _ in range(2):
+            with self.assertLogs(level=logging.WARNING) as logs_cm:
+                self.assertEqual('memory_capacity', util.match_query_key('mem', self.headings))
+            self.assertEqual(1, len(logs_cm.records))
+
+    def test_headings_iterable(self):
+        """Test matching against headings given as a non-sequence iterable."""
+        headings = dict.fromkeys(self.headings).keys()
+        self.assertEqual('memory_type', util.match_query_key('type', headings))
+        self.assertEqual('memory_type', util.match_query_key('type', iter(self.headings)))
+
+    def test_matches_cached(self):
+        """Test that matching the same query against the same headings is only done once."""
+        util._find_query_key_matches.cache_clear()
+        with patch('sat.util.is_subsequence', wraps=util.is_subsequence) as mock_is_subsequence:
+            self.assertEqual('memory_type', util.match_query_key('mtype', self.headings))
+            first_call_count = mock_is_subsequence.call_count
+            for _ in range(2):
+                self.assertEqual('memory_type', util.match_query_key('mtype', self.headings))
+        self.assertEqual(first_call_count, mock_is_subsequence.call_count)
+
+
 class TestEnsurePermissions(unittest.TestCase):
     """Tests for the ensure_permissions() function"""
     def setUp(self):
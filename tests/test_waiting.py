@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,7 +26,7 @@ Unit tests for the sat.waiting module.
 """
 
 import itertools
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 from sat.waiting import (
     DependencyCycleError,
@@ -142,6 +142,18 @@ class TestWaiter(WaiterTestCase):
         waiter = TimeoutWaiter(2)
         self.assertFalse(waiter.wait_for_completion())
 
+    def test_poll_interval_constant_by_default(self):
+        """Test that the interval between polls does not change by default."""
+        waiter = get_mock_waiter([False, False, False])(10, poll_interval=2)
+        self.assertTrue(waiter.wait_for_completion())
+        self.assertEqual([call(2)] * 3, self.mock_time_sleep.mock_calls)
+
+    def test_poll_interval_backoff(self):
+        """Test that the interval between polls grows by poll_backoff up to max_poll_interval."""
+        waiter = get_mock_waiter([False] * 5)(100, poll_interval=1, poll_backoff=2, max_poll_interval=5)
+        self.assertTrue(waiter.wait_for_completion())
+        self.assertEqual([call(1), call(2), call(4), call(5), call(5)], self.mock_time_sleep.mock_calls)
+
     def test_no_negative_retries(self):
         """Test that the number of retries cannot be negative"""
         with self.assertRaises(ValueError):
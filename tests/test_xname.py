@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2019-2022 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2019-2022, 2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,10 +25,16 @@
 Tests for the XName utility class.
 """
 
+from itertools import product
 import unittest
 
 from sat.xname import XName, get_matches
 
+# XName instances used by the get_matches tests, parsed once when the module is
+# imported rather than in every test.
+XNAMES = {xname_str: XName(xname_str)
+          for xname_str in ['x1000c1', 'x2000c2', 'x1000c1r1b1', 'x1000c2r2b2', 'x2000c2r2b2']}
+
 
 class TestXName(unittest.TestCase):
     """Tests for the XName class"""
@@ -196,43 +202,87 @@ class TestXNameContainsComponent(unittest.TestCase):
 
 
 class TestXnameGetMatches(unittest.TestCase):
+    """Tests for the get_matches function"""
+
+    CHASSIS_FILTERS = [XNAMES['x1000c1'], XNAMES['x2000c2']]
+    BMC_FILTERS = [XNAMES['x1000c1r1b1'], XNAMES['x2000c2r2b2']]
+    ELEMS = [XNAMES['x1000c1r1b1'], XNAMES['x1000c2r2b2']]
+
+    # Expected (used, unused, matches, no_matches) results of get_matches().
+    EXPECTED_CHASSIS = (
+        frozenset({XNAMES['x1000c1']}),
+        frozenset({XNAMES['x2000c2']}),
+        frozenset({XNAMES['x1000c1r1b1']}),
+        frozenset({XNAMES['x1000c2r2b2']}),
+    )
+    EXPECTED_BMC = (
+        frozenset({XNAMES['x1000c1r1b1']}),
+        frozenset({XNAMES['x2000c2r2b2']}),
+        frozenset({XNAMES['x1000c1r1b1']}),
+        frozenset({XNAMES['x1000c2r2b2']}),
+    )
+    EXPECTED_EMPTY_FILTERS = (frozenset(), frozenset(), frozenset(), frozenset(ELEMS))
+    EXPECTED_NO_ELEMS = (frozenset(), frozenset(BMC_FILTERS), frozenset(), frozenset())
 
     def test_get_matches_chassis(self):
         """Test Xname get_matches() with chassis filter."""
-        filters = [XName('x1000c1'), XName('x2000c2')]
-        elems = [XName('x1000c1r1b1'), XName('x1000c2r2b2')]
-        used, unused, matches, no_matches = get_matches(filters, elems)
-        self.assertEqual({XName('x1000c1')}, used)
-        self.assertEqual({XName('x2000c2')}, unused)
-        self.assertEqual({XName('x1000c1r1b1')}, matches)
-        self.assertEqual({XName('x1000c2r2b2')}, no_matches)
+        self.assertEqual(self.EXPECTED_CHASSIS, get_matches(self.CHASSIS_FILTERS, self.ELEMS))
 
     def test_get_matches_bmc(self):
         """Test Xname get_matches() with BMC filter."""
-        filters = [XName('x1000c1r1b1'), XName('x2000c2r2b2')]
-        elems = [XName('x1000c1r1b1'), XName('x1000c2r2b2')]
-        used, unused, matches, no_matches = get_matches(filters, elems)
-        self.assertEqual({XName('x1000c1r1b1')}, used)
-        self.assertEqual({XName('x2000c2r2b2')}, unused)
-        self.assertEqual({XName('x1000c1r1b1')}, matches)
-        self.assertEqual({XName('x1000c2r2b2')}, no_matches)
+        self.assertEqual(self.EXPECTED_BMC, get_matches(self.BMC_FILTERS, self.ELEMS))
 
     def test_get_matches_empty_filters(self):
         """Test Xname get_matches() with empty filter."""
-        filters = []
-        elems = [XName('x1000c1r1b1'), XName('x1000c2r2b2')]
-        used, unused, matches, no_matches = get_matches(filters, elems)
-        self.assertEqual(set(), used)
-        self.assertEqual(set(), unused)
-        self.assertEqual(set(), matches)
-        self.assertEqual(set(elems), no_matches)
+        self.assertEqual(self.EXPECTED_EMPTY_FILTERS, get_matches([], self.ELEMS))
 
     def test_get_matches_no_elems(self):
         """Test Xname get_matches() with no elements."""
-        filters = [XName('x1000c1r1b1'), XName('x2000c2r2b2')]
-        elems = []
+        self.assertEqual(self.EXPECTED_NO_ELEMS, get_matches(self.BMC_FILTERS, []))
+
+    def test_get_matches_multiple_levels(self):
+        """Test Xname get_matches() with filters at different levels of the hierarchy."""
+        filters = [XName('x1000'), XName('x1000c1r1'), XName('x1000c1s1b0n0'), XName('x3000')]
+        elems = [XName('x1000c1r1b1'), XName('x1000c1s1b0n0'), XName('x1000c1s10b0n0'), XName('x2000c0r1b0')]
+        expected = (
+            {XName('x1000'), XName('x1000c1r1'), XName('x1000c1s1b0n0')},
+            {XName('x3000')},
+            {XName('x1000c1r1b1'), XName('x1000c1s1b0n0'), XName('x1000c1s10b0n0')},
+            {XName('x2000c0r1b0')},
+        )
+        self.assertEqual(expected, get_matches(filters, elems))
+
+    def test_get_matches_filter_below_elem(self):
+        """Test Xname get_matches() does not match elements contained by a filter's element."""
+        filters = [XName('x1000c1r1b1')]
+        elems = [XName('x1000c1')]
+        self.assertEqual((set(), set(filters), set(), set(elems)), get_matches(filters, elems))
+
+    def test_get_matches_empty_tokens_filter(self):
+        """Test Xname get_matches() with a filter that has no tokens matches every element."""
+        filters = [XName('foo')]
+        self.assertEqual((set(filters), set(), set(self.ELEMS), set()), get_matches(filters, self.ELEMS))
+
+    def _assert_xname_set_equal(self, got, expected):
+        """Assert that two collections of xnames hold the same xnames.
+
+        The xnames are compared as sorted lists of strings so that a failure
+        on a large set shows which xnames differ.
+        """
+        self.assertEqual(sorted(map(str, got)), sorted(map(str, expected)))
+
+    def test_get_matches_many(self):
+        """Test Xname get_matches() against pairwise matching with many xnames."""
+        elems = [XName(f'x{cabinet}c{chassis}s{slot}b0n{node}')
+                 for cabinet, chassis, slot, node in product(range(1000, 1004), range(8), range(8), range(4))]
+        filters = [XName(f'x{cabinet}c{chassis}') for cabinet, chassis in product(range(1002, 1006), range(0, 8, 2))]
+        filters.extend(XName(f'x1000c{chassis}s{slot}') for chassis, slot in product(range(8), range(0, 8, 3)))
+
+        expected_used = {f for f in filters if any(f.contains_component(e) for e in elems)}
+        expected_matches = {e for e in elems if any(f.contains_component(e) for f in filters)}
+
         used, unused, matches, no_matches = get_matches(filters, elems)
-        self.assertEqual(set(), used)
-        self.assertEqual(set(filters), unused)
-        self.assertEqual(set(), matches)
-        self.assertEqual(set(), no_matches)
+        self._assert_xname_set_equal(used, expected_used)
+        self._assert_xname_set_equal(unused, set(filters) - expected_used)
+        self._assert_xname_set_equal(matches, expected_matches)
+        self._assert_xname_set_equal(no_matches, set(elems) - expected_matches)